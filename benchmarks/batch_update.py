@@ -0,0 +1,50 @@
+""" Compares loading a record into a form viewmodel field by field and with ``ViewModel.update``.
+Every field has a few bindings, and a computed summary depends on all of them.
+
+Only Tcl variables are involved, so this runs without a display. From the repository root:
+
+    PYTHONPATH=. python benchmarks/batch_update.py
+"""
+import timeit
+import tkinter as tk
+
+from tkpf import ViewModel, Bindable, AutoProperty, Binding, Computed
+
+FIELDS = 20
+
+Form = type('Form', (ViewModel,), dict(
+    {'field{}'.format(i): Bindable(AutoProperty(str)) for i in range(FIELDS)},
+    summary=Computed(lambda self: ', '.join(getattr(self, 'field{}'.format(i)) for i in range(FIELDS)))))
+
+
+def bind(model, name):
+    prop = getattr(Form, name)
+    binding = Binding(source=model, source_prop=prop, target=None, target_prop='textvariable',
+                      to_model=False, to_view=True)
+    prop.subscriptions(model).bindings.add(binding)
+    return binding
+
+
+def main():
+    tk._default_root = tk.Tcl()
+    form = Form()
+    names = ['field{}'.format(i) for i in range(FIELDS)]
+    bindings = [bind(form, name) for name in names for _ in range(3)] + [bind(form, 'summary')]
+    records = [{name: '{} {}'.format(name, i) for name in names} for i in range(2)]
+    counter = iter(range(10 ** 9))
+
+    def one_by_one():
+        for name, val in records[next(counter) % 2].items():
+            setattr(form, name, val)
+
+    def batched():
+        form.update(**records[next(counter) % 2])
+
+    for fn in (one_by_one, batched):
+        usec = min(timeit.repeat(fn, number=1000, repeat=3)) / 1000 * 1e6
+        print('{:>12} {:10.1f} usec/record'.format(fn.__name__, usec))
+    return bindings
+
+
+if __name__ == '__main__':
+    main()
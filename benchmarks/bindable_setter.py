@@ -0,0 +1,41 @@
+""" Measures the cost of one Bindable setter call as the number of ViewModel instances grows.
+
+Only Tcl variables are involved, so this runs without a display. From the repository root:
+
+    PYTHONPATH=. python benchmarks/bindable_setter.py
+"""
+import timeit
+import tkinter as tk
+
+from tkpf import ViewModel, Bindable, AutoProperty, Binding
+
+
+class Row(ViewModel):
+    value = Bindable(AutoProperty(int))
+
+
+def bind(row):
+    binding = Binding(source=row, source_prop=Row.value,
+                      target=None, target_prop='textvariable',
+                      to_model=False, to_view=True)
+    Row.value.subscriptions(row).bindings.add(binding)
+    return binding
+
+
+def main():
+    tk._default_root = tk.Tcl()
+    rows, bindings = [], []
+    print('{:>10} {:>14}'.format('instances', 'usec/set'))
+    for count in (10, 100, 1000, 10000):
+        while len(rows) < count:
+            row = Row()
+            rows.append(row)
+            bindings.append(bind(row))
+        row = rows[0]
+        number = 20000
+        elapsed = timeit.timeit(lambda: setattr(row, 'value', 1), number=number)
+        print('{:>10} {:>14.3f}'.format(count, elapsed / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
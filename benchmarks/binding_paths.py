@@ -0,0 +1,74 @@
+""" Measures bindings to dotted paths like ``customer.address.city``: updating the view when the property
+at the end changes, compared to a binding to a property of the viewmodel itself, and following the path
+again when a viewmodel along it gets replaced.
+
+The bindings configure no widgets, so this runs without a display. From the repository root:
+
+    PYTHONPATH=. python benchmarks/binding_paths.py
+"""
+import timeit
+import tkinter as tk
+
+from tkpf import ViewModel, Bindable, AutoProperty, Binding
+from tkpf.BindingPath import BindingPath
+
+BINDINGS = 100
+
+
+class Address(ViewModel):
+    city = Bindable(AutoProperty(str))
+
+
+class Customer(ViewModel):
+    address = Bindable(AutoProperty(Address))
+
+
+class Order(ViewModel):
+    customer = Bindable(AutoProperty(Customer))
+    city = Bindable(AutoProperty(str))
+
+
+def bind(model, expr):
+    path = BindingPath(model, expr) if '.' in expr else None
+    source = path.source if path else model
+    source_property = path.source_property if path else getattr(type(model), expr)
+    binding = Binding(source=source, source_prop=source_property, target=None, target_prop='text',
+                      to_model=False, to_view=True, config_method=lambda **kwargs: None, path=path)
+    source_property.subscriptions(source).bindings.add(binding)
+    return binding
+
+
+def main():
+    tk._default_root = tk.Tcl()
+    order = Order()
+    direct = [bind(order, 'city') for _ in range(BINDINGS)]
+    paths = [bind(order, 'customer.address.city') for _ in range(BINDINGS)]
+    values = iter(range(10 ** 9))
+    customers = [Customer(), Customer()]
+    addresses = [Address(), Address()]
+
+    def set_direct():
+        order.city = str(next(values))
+
+    def set_through_path():
+        order.customer.address.city = str(next(values))
+
+    def replace_customer():
+        customers.reverse()
+        order.customer = customers[0]
+
+    def replace_address():
+        addresses.reverse()
+        order.customer.address = addresses[0]
+
+    print('{} bindings'.format(BINDINGS))
+    for name, fn in (('set city', set_direct), ('set customer.address.city', set_through_path),
+                     ('replace customer', replace_customer), ('replace customer.address', replace_address)):
+        seconds = min(timeit.repeat(fn, number=200, repeat=3)) / 200
+        print('{:>28} {:>10.1f} usec'.format(name, seconds * 1e6))
+    for binding in direct + paths:
+        binding.unbind()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+""" Measures flipping between two panels of 100 bound entries with an ``If``, compared to constructing
+the shown panel again each time, and what the bindings of the hidden panel cost when its properties change.
+
+The first part needs a display, the second runs without one. From the repository root:
+
+    PYTHONPATH=. python benchmarks/conditional_views.py
+"""
+import timeit
+import tkinter as tk
+import xml.etree.ElementTree as Xml
+
+from tkpf import Component, ViewModel, Bindable, AutoProperty, Binding, Fragment, template
+from tkpf.parser import wrap
+
+FIELDS = 100
+
+
+class PanelModel(ViewModel):
+    advanced = Bindable(AutoProperty(False))
+    value = Bindable(AutoProperty(str))
+
+
+def panel(name):
+    return '<Frame>{}\n</Frame>'.format(''.join("""
+        <Label grid-row="{0}" grid-column="0">{1} {0}</Label>
+        <Entry grid-row="{0}" grid-column="1" textvariable="[(value)]"/>""".format(i, name) for i in range(FIELDS)))
+
+
+class Panels(Component):
+    template = '<Frame><If condition="[advanced]">{}<Frame if-else="true">{}</Frame></If></Frame>'.format(
+        panel('Advanced'), panel('Simple')[len('<Frame>'):-len('</Frame>')])
+
+
+def flipping(root):
+    model = PanelModel()
+    Panels(root, None, model)
+    cached = min(timeit.repeat(lambda: setattr(model, 'advanced', not model.advanced), number=20, repeat=3)) / 20
+
+    simple = template.compile_tree(wrap(Xml.fromstring(panel('Simple'))))
+    advanced = template.compile_tree(wrap(Xml.fromstring(panel('Advanced'))))
+    view = Panels(root, None, PanelModel())
+    shown = []
+
+    def rebuild():
+        if shown:
+            shown.pop().root_widget.destroy()
+        shown.append(Fragment(view.root_widget, view, view.model, simple if len(shown) % 2 else advanced))
+        shown[-1].root_widget.pack()
+    rebuilt = min(timeit.repeat(rebuild, number=20, repeat=3)) / 20
+    print('{:>24} {:>10.3f} ms'.format('flip with If', cached * 1e3))
+    print('{:>24} {:>10.3f} ms'.format('construct again', rebuilt * 1e3))
+
+
+def hidden_updates():
+    model = PanelModel()
+    bindings = []
+    for _ in range(FIELDS):
+        binding = Binding(source=model, source_prop=PanelModel.value, target=None, target_prop='text',
+                          to_model=False, to_view=True, config_method=lambda **kwargs: None)
+        PanelModel.value.subscriptions(model).bindings.add(binding)
+        bindings.append(binding)
+    values = iter(range(10 ** 9))
+
+    def change():
+        model.value = str(next(values))
+    shown = min(timeit.repeat(change, number=200, repeat=3)) / 200
+    for binding in bindings:
+        binding.suspend()
+    hidden = min(timeit.repeat(change, number=200, repeat=3)) / 200
+    resume = min(timeit.repeat(lambda: [binding.suspend() or binding.resume() for binding in bindings],
+                               number=20, repeat=3)) / 20
+    print('{:>24} {:>10.1f} usec'.format('change, shown', shown * 1e6))
+    print('{:>24} {:>10.1f} usec'.format('change, hidden', hidden * 1e6))
+    print('{:>24} {:>10.1f} usec'.format('suspend and resume', resume * 1e6))
+
+
+def main():
+    print('{} bindings per panel'.format(FIELDS))
+    hidden_updates()
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print('Skipped flipping, no display: {}'.format(e))
+        return
+    root.withdraw()
+    flipping(root)
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main()
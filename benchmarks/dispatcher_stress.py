@@ -0,0 +1,63 @@
+""" Hammers bindable properties from many worker threads while the Tk thread drains the dispatcher,
+then checks that every binding ended up showing the final value of its property.
+
+Only Tcl variables are involved, so this runs without a display. From the repository root:
+
+    PYTHONPATH=. python benchmarks/dispatcher_stress.py
+"""
+import threading
+import time
+import tkinter as tk
+
+from tkpf import ViewModel, Bindable, AutoProperty, Binding
+from tkpf.Dispatcher import Dispatcher
+
+THREADS = 16
+WRITES = 20000
+MODELS = 50
+
+
+class Row(ViewModel):
+    value = Bindable(AutoProperty(int))
+    label = Bindable(AutoProperty())
+
+
+def bind(row, prop):
+    binding = Binding(source=row, source_prop=prop,
+                      target=None, target_prop='textvariable',
+                      to_model=False, to_view=True)
+    prop.subscriptions(row).bindings.add(binding)
+    return binding
+
+
+def hammer(rows, seed):
+    for i in range(WRITES):
+        row = rows[(i + seed) % len(rows)]
+        row.value = i
+        row.label = str(i)
+
+
+def main():
+    root = tk._default_root = tk.Tcl()
+    dispatcher = Dispatcher.install(root)
+    rows = [Row() for _ in range(MODELS)]
+    bindings = [bind(row, prop) for row in rows for prop in (Row.value, Row.label)]
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=hammer, args=(rows, seed)) for seed in range(THREADS)]
+    for worker in workers:
+        worker.start()
+    while any(worker.is_alive() for worker in workers) or dispatcher.queue:
+        root.update()
+    elapsed = time.perf_counter() - start
+
+    stale = [b for b in bindings if b.safe_get() != b.source_property.fget(b.source)]
+    print('{} writes from {} threads in {:.2f} s, {} stale bindings'.format(
+        THREADS * WRITES * 2, THREADS, elapsed, len(stale)))
+    dispatcher.stop()
+    if stale:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
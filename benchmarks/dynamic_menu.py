@@ -0,0 +1,78 @@
+""" Measures keeping a 'recent files' menu of 500 entries up to date: opening a file moves it to the top
+and drops the oldest one. The menu is bound to an ``ObservableList``, whose changes only insert and delete
+the affected entries, compared to assigning a new list, which constructs all the entries again.
+
+Needs a display. From the repository root:
+
+    PYTHONPATH=. python benchmarks/dynamic_menu.py
+"""
+import timeit
+import tkinter as tk
+
+from tkpf import Component, ViewModel, Bindable, AutoProperty, ObservableList
+
+ENTRIES = 500
+
+
+class RecentFile(ViewModel):
+    name = Bindable(AutoProperty(str))
+
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+
+    def reopen(self):
+        pass
+
+
+class RecentFiles(ViewModel):
+    files = Bindable(AutoProperty(ObservableList))
+
+
+class RecentMenu(Component):
+    template = """<Menu>
+        <Menu label="File">
+            <Menu label="Recent files" items="[files]">
+                <Command label="[name]" command="reopen"/>
+            </Menu>
+        </Menu>
+    </Menu>"""
+
+
+def measure(root):
+    model = RecentFiles()
+    model.files = ObservableList(RecentFile('file{}.txt'.format(i)) for i in range(ENTRIES))
+    RecentMenu(root, None, model)
+    names = iter(range(ENTRIES, 10 ** 9))
+
+    def open_file():
+        model.files.insert(0, RecentFile('file{}.txt'.format(next(names))))
+        del model.files[-1]
+
+    def open_file_rebuild():
+        files = list(model.files)
+        model.files = ObservableList([RecentFile('file{}.txt'.format(next(names)))] + files[:-1])
+
+    def rename():
+        model.files[ENTRIES // 2].name = 'file{}.txt'.format(next(names))
+
+    print('{} entries'.format(ENTRIES))
+    for name, fn, number in (('open, incremental', open_file, 200), ('open, rebuilt', open_file_rebuild, 5),
+                             ('rename', rename, 200)):
+        seconds = min(timeit.repeat(fn, number=number, repeat=3)) / number
+        print('{:>20} {:>10.3f} ms'.format(name, seconds * 1e3))
+
+
+def main():
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print('Skipped, no display: {}'.format(e))
+        return
+    root.withdraw()
+    measure(root)
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main()
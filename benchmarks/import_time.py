@@ -0,0 +1,53 @@
+""" Measures how long importing tkpf takes, for the bare package and for the imports of a typical application,
+and lists the modules that take the most of it. Every measurement runs in a fresh interpreter,
+using its ``-X importtime`` option, and the median of several runs is reported. From the repository root:
+
+    PYTHONPATH=. python benchmarks/import_time.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+statements = {
+    'import tkpf': 'import tkpf',
+    'application': 'from tkpf import Window, ViewModel, Bindable, AutoProperty, Binding',
+    'yaml template': 'from tkpf import Component, template; template.load_yaml("a: b")',
+    'everything': 'import tkpf; [getattr(tkpf, name) for name in dir(tkpf)]',
+}
+runs = 7
+top = 8
+
+
+def measure(statement):
+    """ Import times of one run in microseconds, as (cumulative, nested) by module name """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.getcwd(), os.environ.get('PYTHONPATH')])))
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], env=env,
+                            stderr=subprocess.PIPE, universal_newlines=True, check=True).stderr
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        # Modules imported by other modules are indented
+        times[name.strip()] = (int(cumulative), name.startswith('  '))
+    return times
+
+
+def main():
+    startup = measure('pass')  # Imported by the interpreter itself
+    for name, statement in statements.items():
+        results = [measure(statement) for _ in range(runs)]
+        totals = [sum(cumulative for module, (cumulative, nested) in times.items()
+                      if not nested and module not in startup)
+                  for times in results]
+        print('{:<14} {:>9.1f} ms   {}'.format(name, statistics.median(totals) / 1e3, statement))
+        slowest = sorted((item for item in results[-1].items() if item[0] not in startup),
+                         key=lambda item: item[1][0], reverse=True)
+        for module, (cumulative, nested) in slowest[:top]:
+            print('{:>14} {:>9.1f} ms   {}'.format('', cumulative / 1e3, module))
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+""" Measures the latency from a keystroke in a two-way bound entry to the model and the other bound widgets,
+as the number of other bindings to the same property grows, and the cost of setting the property
+to the value it already has.
+
+Keystrokes are simulated by writing the Tcl variable of the entry from Tcl, as the entry widget does,
+so this runs without a display. From the repository root:
+
+    PYTHONPATH=. python benchmarks/keystroke_latency.py
+"""
+import timeit
+import tkinter as tk
+
+from tkpf import ViewModel, Bindable, AutoProperty, Binding
+
+
+class Search(ViewModel):
+    text = Bindable(AutoProperty(str))
+
+
+def bind(model, target_prop, to_model=False):
+    binding = Binding(source=model, source_prop=Search.text,
+                      target=None, target_prop=target_prop,
+                      to_model=to_model, to_view=True,
+                      config_method=lambda **kwargs: None)
+    Search.text.subscriptions(model).bindings.add(binding)
+    return binding
+
+
+def main():
+    root = tk._default_root = tk.Tcl()
+    print('{:>9} {:>16} {:>16}'.format('bindings', 'usec/keystroke', 'usec/no-op set'))
+    for count in (1, 10, 100, 1000):
+        model = Search()
+        entry = bind(model, 'textvariable', to_model=True)
+        others = [bind(model, 'textvariable' if i % 2 else 'text') for i in range(count - 1)]
+        name = str(entry.var)
+
+        def keystroke(texts=iter(range(10 ** 9))):
+            root.globalsetvar(name, str(next(texts)))
+
+        def no_op():
+            model.text = model.text
+        number = 2000
+        typing = min(timeit.repeat(keystroke, number=number, repeat=3)) / number * 1e6
+        same = min(timeit.repeat(no_op, number=number, repeat=3)) / number * 1e6
+        assert model.text == root.globalgetvar(name)
+        print('{:>9} {:>16.3f} {:>16.3f}'.format(count, typing, same))
+        for binding in [entry] + others:
+            binding.unbind()
+
+
+if __name__ == '__main__':
+    main()
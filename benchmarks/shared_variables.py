@@ -0,0 +1,45 @@
+""" Measures the cost of setting a bindable property edited by one widget and displayed by many others,
+and the number of Tcl variables its bindings create.
+
+Only Tcl variables are involved, so this runs without a display. From the repository root:
+
+    PYTHONPATH=. python benchmarks/shared_variables.py
+"""
+import timeit
+import tkinter as tk
+
+from tkpf import ViewModel, Bindable, AutoProperty, Binding
+
+
+class Dashboard(ViewModel):
+    value = Bindable(AutoProperty(int))
+
+
+def bind(model, to_model):
+    binding = Binding(source=model, source_prop=Dashboard.value,
+                      target=None, target_prop='textvariable',
+                      to_model=to_model, to_view=True)
+    Dashboard.value.subscriptions(model).bindings.add(binding)
+    return binding
+
+
+def main():
+    root = tk._default_root = tk.Tcl()
+    print('{:>9} {:>10} {:>14}'.format('bindings', 'variables', 'usec/set'))
+    for count in (1, 10, 100):
+        model = Dashboard()
+        before = len(root.call('info', 'globals'))
+        bindings = [bind(model, to_model=i == 0) for i in range(count)]
+        variables = len(root.call('info', 'globals')) - before
+
+        def set_value(values=iter(range(10 ** 9))):
+            model.value = next(values)
+        usec = min(timeit.repeat(set_value, number=10000, repeat=3)) / 10000 * 1e6
+        print('{:>9} {:>10} {:>14.3f}'.format(count, variables, usec))
+        for binding in bindings:
+            binding.unbind()
+        del bindings
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,394 @@
+""" Runs all tkpf benchmarks and reports their results in a machine readable form,
+so that releases can be compared with each other.
+
+Cases that create widgets need a display. Run the suite under Xvfb on machines without one::
+
+    xvfb-run python benchmarks/suite.py --output results.json
+
+Without a display, only the cases that need nothing but Tcl variables run, and the others are reported as skipped.
+
+Options:
+
+* ``--output FILE`` writes the results as JSON: ``{"meta": {...}, "results": {case: {metric: value}}}``.
+  Every metric is lower-is-better, and its name ends with its unit.
+* ``--compare FILE`` compares the results with an earlier output, and exits with status 1
+  if any metric got worse by more than ``--threshold`` (1.5 by default, timings are noisy).
+* ``--profile CASE`` runs a single case under cProfile and prints the most expensive functions instead.
+* Positional arguments select cases by name.
+
+The components of the example application are used as fixtures, next to synthetic large templates.
+"""
+import argparse
+import cProfile
+import gc
+import json
+import os
+import platform
+import pstats
+import sys
+import tempfile
+import time
+import timeit
+import tkinter as tk
+import tracemalloc
+import types
+import xml.etree.ElementTree as Xml
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [REPOSITORY, os.path.join(REPOSITORY, 'example')]
+
+from tkpf import Component, ViewModel, Bindable, AutoProperty, Binding, Computed, codegen, parser, template
+from tkpf import instrumentation
+
+CASES = []
+
+
+def case(needs_display):
+    """ Register a benchmark function. It gets the Tk root and returns a dictionary of metrics. """
+    def decorator(fn):
+        CASES.append((fn.__name__, needs_display, fn))
+        return fn
+    return decorator
+
+
+def best_of(fn, number, repeat=5) -> float:
+    """ The shortest time of one call of ``fn``, in seconds """
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+class BenchModel(ViewModel):
+    value = Bindable(AutoProperty(str))
+    count = Bindable(AutoProperty(int))
+    enabled = Bindable(AutoProperty(True))
+
+    @Computed
+    def summary(self) -> str:
+        return '{} ({})'.format(self.value, self.count)
+
+    def clicked(self):
+        pass
+
+
+def synthetic_template(rows) -> str:
+    """ A grid of ``rows`` rows with four bound widgets each """
+    return '<Frame>{}\n</Frame>'.format(''.join("""
+    <Label grid-row="{0}" grid-column="0" text="[value]"/>
+    <Entry grid-row="{0}" grid-column="1" textvariable="[(value)]" width="20"/>
+    <Checkbutton grid-row="{0}" grid-column="2" variable="[(enabled)]">Enabled</Checkbutton>
+    <Button grid-row="{0}" grid-column="3" command="clicked">Row {0}</Button>""".format(i) for i in range(rows)))
+
+
+def bind(model, prop, target_prop, to_model=False):
+    """ A binding without a widget, so that only tkpf and Tcl variables are measured """
+    binding = Binding(source=model, source_prop=prop, target=None, target_prop=target_prop,
+                      to_model=to_model, to_view=True, config_method=lambda **kwargs: None)
+    prop.subscriptions(model).bindings.add(binding)
+    return binding
+
+
+def counter():
+    values = iter(range(10 ** 9))
+    return lambda: str(next(values))
+
+
+@case(needs_display=False)
+def parse_template(root):
+    """ Parsing and compiling templates, which happens once per component class """
+    ret = {}
+    for rows in (25, 250):
+        source = synthetic_template(rows)
+        seconds = best_of(lambda: template.compile_tree(parser.wrap(Xml.fromstring(source))), number=5)
+        ret['xml_{}_widgets_ms'.format(rows * 4 + 1)] = seconds * 1e3
+    for extension in ('xml', 'yaml'):
+        cls = type('Example', (), dict(template=None, template_yaml=None,
+                                       template_path='example/ExampleWindow.' + extension))
+        ret['example_{}_ms'.format(extension)] = best_of(lambda: template.compile_tree(template.parse(cls)),
+                                                         number=20) * 1e3
+    return ret
+
+
+@case(needs_display=False)
+def set_to_view(root):
+    """ Setting a bindable property, until its bound Tcl variables and options are updated """
+    ret = {}
+    model = BenchModel()
+    values = counter()
+    bindings = [bind(model, BenchModel.value, 'textvariable')]
+    ret['variable_binding_usec'] = best_of(lambda: setattr(model, 'value', values()), number=10000) * 1e6
+    bindings.append(bind(model, BenchModel.value, 'text'))
+    ret['variable_and_option_binding_usec'] = best_of(lambda: setattr(model, 'value', values()),
+                                                      number=10000) * 1e6
+    bindings += [bind(model, BenchModel.value, 'textvariable') for _ in range(98)]
+    ret['100_bindings_usec'] = best_of(lambda: setattr(model, 'value', values()), number=1000) * 1e6
+    bindings.append(bind(model, BenchModel.summary, 'text'))
+    ret['100_bindings_and_computed_usec'] = best_of(lambda: setattr(model, 'value', values()),
+                                                    number=1000) * 1e6
+    ret['no_op_set_usec'] = best_of(lambda: setattr(model, 'value', model.value), number=10000) * 1e6
+    for binding in bindings:
+        binding.unbind()
+    return ret
+
+
+@case(needs_display=False)
+def entry_round_trip(root):
+    """ A keystroke in a two-way bound entry, until the model and the other bound widgets are updated """
+    model = BenchModel()
+    entry = bind(model, BenchModel.value, 'textvariable', to_model=True)
+    label = bind(model, BenchModel.value, 'text')
+    name = str(entry.var)
+    values = counter()
+    seconds = best_of(lambda: root.globalsetvar(name, values()), number=10000)
+    assert model.value == root.globalgetvar(name)
+    entry.unbind()
+    label.unbind()
+    return {'keystroke_usec': seconds * 1e6}
+
+
+@case(needs_display=False)
+def instrumentation_overhead(root):
+    """ Setting a bound property after tkpf.instrumentation has been disabled again, and while it is enabled """
+    model = BenchModel()
+    bindings = [bind(model, BenchModel.value, 'textvariable'), bind(model, BenchModel.value, 'text')]
+    values = counter()
+    ret = {}
+    instrumentation.enable()
+    ret['enabled_usec'] = best_of(lambda: setattr(model, 'value', values()), number=10000) * 1e6
+    instrumentation.disable()
+    instrumentation.reset()
+    ret['disabled_usec'] = best_of(lambda: setattr(model, 'value', values()), number=10000) * 1e6
+    for binding in bindings:
+        binding.unbind()
+    return ret
+
+
+def measure_construction(root, cls, model_factory, number=5) -> float:
+    """ The time of constructing a component in a new toplevel window and destroying it, in milliseconds """
+    def construct():
+        window = tk.Toplevel(root)
+        cls(window, None, model_factory())
+        window.update_idletasks()
+        window.destroy()
+    construct()  # Parse and compile the template before measuring
+    return best_of(construct, number=number) * 1e3
+
+
+@case(needs_display=True)
+def construct_synthetic(root):
+    """ Constructing large synthetic components from their templates and from generated modules """
+    ret = {}
+    for rows in (25, 250):
+        source = synthetic_template(rows)
+        interpreted = type('Rows{}'.format(rows), (Component,), dict(template=source))
+        ret['{}_widgets_ms'.format(rows * 4 + 1)] = measure_construction(root, interpreted, BenchModel)
+
+        module = types.ModuleType('Rows{}_xml'.format(rows))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'Rows.xml')
+            with open(path, 'w') as f:
+                f.write(source)
+            exec(compile(codegen.generate(path), path, 'exec'), module.__dict__)
+        generated = type('GeneratedRows{}'.format(rows), (Component,), dict(template_module=module))
+        ret['{}_widgets_generated_ms'.format(rows * 4 + 1)] = measure_construction(root, generated, BenchModel)
+    return ret
+
+
+@case(needs_display=True)
+def construct_example(root):
+    """ Constructing the window of the example application, from both of its templates """
+    from ExampleModel import ExampleModel
+    from ExampleWindow import ExampleWindow
+    import ExampleComponent  # Registers the component
+
+    ret = {}
+    for extension in ('xml', 'yaml'):
+        view = type('Example' + extension.capitalize(), (ExampleWindow,), dict(
+            template_path='example/ExampleWindow.' + extension,
+            __init__=Component.__init__))
+        ret['example_{}_ms'.format(extension)] = measure_construction(root, view, ExampleModel)
+    return ret
+
+
+def notebook_template(lazy) -> str:
+    tabs = ''.join('<Frame tab-text="Tab {}">{}</Frame>'.format(
+        i, '<Label text="[value]"/><Entry textvariable="[(value)]"/>' * 10) for i in range(20))
+    return '<Notebook lazy="{}">{}</Notebook>'.format(str(lazy).lower(), tabs)
+
+
+def menu_template() -> str:
+    items = ''.join('<Command command="clicked">Item {}</Command>'
+                    '<Checkbutton variable="[(enabled)]">Option {}</Checkbutton>'.format(i, i) for i in range(50))
+    return '<Frame><Menu><Menu label="File">{}</Menu></Menu></Frame>'.format(items)
+
+
+@case(needs_display=True)
+def construct_notebook_and_menu(root):
+    """ Constructing a notebook of 20 tabs of 20 widgets eagerly and lazily, and a menu of 100 items """
+    ret = {}
+    for lazy in (False, True):
+        cls = type('Tabs', (Component,), dict(template=notebook_template(lazy)))
+        ret['notebook_{}_ms'.format('lazy' if lazy else 'eager')] = measure_construction(root, cls, BenchModel)
+    cls = type('Menus', (Component,), dict(template=menu_template()))
+    ret['menu_ms'] = measure_construction(root, cls, BenchModel)
+    return ret
+
+
+class RowModel(ViewModel):
+    name = Bindable(AutoProperty(str))
+
+
+class ItemsModel(ViewModel):
+    items = Bindable(AutoProperty(list))
+
+
+class RowLabel(Component):
+    template = '<Label name="label" text="[name]"/>'
+
+
+class ScrolledRows(Component):
+    template = """<Frame>
+        <ItemsControl items="[items]" rows="20">
+            <Frame><Entry textvariable="[(name)]"/><RowLabel/></Frame>
+        </ItemsControl>
+    </Frame>"""
+
+
+@case(needs_display=True)
+def scroll_items(root):
+    """ Scrolling an ItemsControl of 1000 items by one row, with a component in each row """
+    model = ItemsModel()
+    for i in range(1000):
+        model.items.append(RowModel())
+        model.items[-1].name = 'Item {}'.format(i)
+    window = tk.Toplevel(root)
+    view = ScrolledRows(window, None, model)
+    items = view.child_directives[0]
+    ret = {'scroll_row_ms': best_of(lambda: items.scroll_to(items.offset % 900 + 1), number=50) * 1e3}
+    # The recycled rows have to show their new items, down to the components inside them
+    for container, item in zip(items.containers, model.items[items.offset:]):
+        label = container.child_directives[0].label
+        if label.cget('text') != item.name:
+            raise AssertionError('The row of {} shows {}'.format(item.name, label.cget('text')))
+    window.destroy()
+    return ret
+
+
+@case(needs_display=True)
+def memory_per_component(root):
+    """ The memory allocated by Python for each constructed component, widgets and bindings included """
+    from ExampleModel import ExampleModel
+    from ExampleWindow import ExampleWindow
+    import ExampleComponent  # Registers the component
+
+    fixtures = (
+        ('101_widgets', type('Rows', (Component,), dict(template=synthetic_template(25))), BenchModel),
+        ('example', type('ExampleMemory', (ExampleWindow,), dict(template_path='example/ExampleWindow.xml',
+                                                                  __init__=Component.__init__)), ExampleModel),
+    )
+    ret = {}
+    count = 50
+    for name, cls, model_factory in fixtures:
+        window = tk.Toplevel(root)
+        cls(tk.Toplevel(window), None, model_factory())  # Parse and compile the template before measuring
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        views = [cls(tk.Toplevel(window), None, model_factory()) for _ in range(count)]
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        ret['{}_bytes'.format(name)] = sum(stat.size_diff for stat in after.compare_to(before, 'filename')) / count
+        del views
+        window.destroy()
+    return ret
+
+
+def create_root() -> tuple:
+    """ A Tk root window if there is a display, and a Tcl interpreter otherwise, and whether there is a display """
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        root, has_display = tk.Tcl(), False
+    else:
+        root.withdraw()
+        has_display = True
+    tk._default_root = root
+    return root, has_display
+
+
+def run(names, root, has_display) -> dict:
+    results = {}
+    for name, needs_display, fn in CASES:
+        if names and name not in names:
+            continue
+        if needs_display and not has_display:
+            results[name] = {'skipped': 'no display'}
+            print('{:<28} skipped, no display'.format(name))
+            continue
+        results[name] = fn(root)
+        label = name
+        for metric, value in sorted(results[name].items()):
+            print('{:<28} {:<36} {:12.3f}'.format(label, metric, value))
+            label = ''
+    return results
+
+
+def compare(results, baseline, threshold) -> list:
+    """ Print the ratios of the metrics to the baseline, and return the names of those above the threshold """
+    regressions = []
+    for name, metrics in sorted(results.items()):
+        for metric, value in sorted(metrics.items()):
+            old = baseline.get(name, {}).get(metric)
+            if not isinstance(value, (int, float)) or not isinstance(old, (int, float)) or not old:
+                continue
+            ratio = value / old
+            marker = ' REGRESSION' if ratio > threshold else ''
+            print('{:<28} {:<36} {:6.2f}x{}'.format(name, metric, ratio, marker))
+            if marker:
+                regressions.append('{}.{}'.format(name, metric))
+    return regressions
+
+
+def main():
+    argparser = argparse.ArgumentParser(description='Run the tkpf benchmarks')
+    argparser.add_argument('cases', nargs='*', help='the cases to run, all of them by default')
+    argparser.add_argument('--output', help='write the results to this JSON file')
+    argparser.add_argument('--compare', help='compare the results with this earlier JSON output')
+    argparser.add_argument('--threshold', type=float, default=1.5,
+                           help='the ratio to the earlier result above which a metric is a regression')
+    argparser.add_argument('--profile', metavar='CASE', help='profile a single case')
+    argparser.add_argument('--label', help='a label for the results, such as the version being measured')
+    args = argparser.parse_args()
+
+    os.chdir(REPOSITORY)  # The example templates are referred to by relative paths
+    root, has_display = create_root()
+
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.runcall(run, [args.profile], root, has_display)
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(30)
+        return 0
+
+    results = run(args.cases, root, has_display)
+    meta = {
+        'label': args.label,
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'tk': str(root.call('info', 'patchlevel')),
+        'platform': platform.platform(),
+        'display': has_display,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'meta': meta, 'results': results}, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print('Regressions: ' + ', '.join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
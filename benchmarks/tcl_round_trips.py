@@ -0,0 +1,78 @@
+""" Counts the round trips from Python to Tcl, and measures the time, of constructing a form of 2000 widgets,
+with the Tcl commands of its construction batched into scripts and without.
+
+Real widgets are created, so this needs a display. From the repository root:
+
+    PYTHONPATH=. python benchmarks/tcl_round_trips.py
+"""
+import sys
+import time
+import tkinter as tk
+
+from tkpf import Component, ViewModel, Bindable, AutoProperty
+from tkpf.TclBatch import TclBatch
+
+ROWS = 500
+
+
+class FormModel(ViewModel):
+    value = Bindable(AutoProperty(str))
+    enabled = Bindable(AutoProperty(True))
+
+    def clicked(self):
+        pass
+
+
+class Form(Component):
+    template = '<Frame>{}\n</Frame>'.format(''.join("""
+    <Label grid-row="{0}" grid-column="0">Field {0}</Label>
+    <Entry grid-row="{0}" grid-column="1" textvariable="[(value)]" width="20"/>
+    <Checkbutton grid-row="{0}" grid-column="2" variable="[(enabled)]">Enabled</Checkbutton>
+    <Button grid-row="{0}" grid-column="3" command="clicked">Apply</Button>""".format(i) for i in range(ROWS)))
+
+
+class CountingInterpreter:
+    """ Passes everything on to the Tcl interpreter, counting the commands and scripts evaluated """
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.count = 0
+
+    def call(self, *args):
+        self.count += 1
+        return self.interpreter.call(*args)
+
+    def eval(self, script):
+        self.count += 1
+        return self.interpreter.eval(script)
+
+    def __getattr__(self, item):
+        return getattr(self.interpreter, item)
+
+
+def main():
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print('Skipped, no display: {}'.format(e))
+        return
+    root.withdraw()
+    counting = root.tk = CountingInterpreter(root.tk)
+
+    print('{} widgets'.format(ROWS * 4 + 1))
+    for enabled in (False, True):
+        TclBatch.enabled = enabled
+        window = tk.Toplevel(root)
+        counting.count = 0
+        start = time.perf_counter()
+        Form(window, None, FormModel())
+        window.update_idletasks()
+        elapsed = time.perf_counter() - start
+        print('{:>10} {:8d} round trips {:10.1f} ms'.format('batched' if enabled else 'unbatched',
+                                                            counting.count, elapsed * 1000))
+        window.destroy()
+    root.destroy()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
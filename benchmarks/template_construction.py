@@ -0,0 +1,100 @@
+""" Compares constructing a large window from its template with constructing it from the module
+that tkpf.codegen generates from the same template.
+
+First it checks, without a display, that the subtrees the generated modules of the example templates
+leave to the interpreter compile to the same nodes as in the interpreted templates.
+Real widgets are created for the comparison, so that needs a display. From the repository root:
+
+    PYTHONPATH=. python benchmarks/template_construction.py
+"""
+import os
+import sys
+import tempfile
+import timeit
+import tkinter as tk
+import types
+import xml.etree.ElementTree as Xml
+
+from tkpf import Component, ViewModel, Bindable, AutoProperty, codegen, parser, template
+
+ROWS = 100
+
+
+class RowsModel(ViewModel):
+    value = Bindable(AutoProperty(str))
+    enabled = Bindable(AutoProperty(True))
+
+    def clicked(self):
+        pass
+
+
+def write_template(directory) -> str:
+    rows = ''.join("""
+    <Label grid-row="{0}" grid-column="0" text="[value]"/>
+    <Entry grid-row="{0}" grid-column="1" textvariable="[(value)]" width="20"/>
+    <Checkbutton grid-row="{0}" grid-column="2" variable="[(enabled)]">Enabled</Checkbutton>
+    <Button grid-row="{0}" grid-column="3" command="clicked">Row {0}</Button>""".format(i) for i in range(ROWS))
+    path = os.path.join(directory, 'Rows.xml')
+    with open(path, 'w') as f:
+        f.write('<Frame>{}\n</Frame>'.format(rows))
+    return path
+
+
+def subtrees(node):
+    yield node
+    for child in node.children:
+        yield from subtrees(child)
+
+
+def check_generated_nodes():
+    """ Fail if a subtree left to the interpreter by a generated module differs from the interpreted one """
+    example = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'example')
+    for name in ('ExampleWindow.xml', 'ExampleWindow.yaml'):
+        path = os.path.join(example, name)
+        if name.endswith('.xml'):
+            tree = template.compile_tree(parser.wrap(Xml.parse(path)))
+        else:
+            with open(path) as f:
+                tree = template.compile_tree(parser.wrap(template.load_yaml(f)))
+        module = types.ModuleType(name)
+        exec(compile(codegen.generate(path), path, 'exec'), module.__dict__)
+        interpreted = list(subtrees(tree))
+        generated = [value for key, value in vars(module).items() if key.startswith('_node')]
+        for node in generated:
+            if node not in interpreted:
+                raise AssertionError('{}: the generated module compiles {} differently'.format(name, node.name))
+        print('{}: {} generated subtrees match'.format(name, len(generated)))
+
+
+def main():
+    check_generated_nodes()
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print('Skipped, no display: {}'.format(e))
+        return
+    root.withdraw()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_template(directory)
+        module = types.ModuleType('Rows_xml')
+        exec(compile(codegen.generate(path), path, 'exec'), module.__dict__)
+
+        class Interpreted(Component):
+            template_path = path
+
+        class Generated(Component):
+            template_module = module
+
+        Interpreted(root, None, RowsModel())  # Parse and compile the template before measuring
+        print('{} widgets'.format(ROWS * 4 + 1))
+        for cls in (Interpreted, Generated):
+            def construct():
+                cls(root, None, RowsModel()).root_widget.destroy()
+            best = min(timeit.repeat(construct, number=5, repeat=5)) / 5
+            print('{:>12} {:8.2f} ms'.format(cls.__name__, best * 1000))
+    root.destroy()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
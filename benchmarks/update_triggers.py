@@ -0,0 +1,71 @@
+""" Measures typing a word into an entry bound two-way to a property whose setter filters a list,
+with the update triggers of the binding: on every change, debounced, and on focus-out.
+
+Keystrokes are simulated by writing the Tcl variable of the entry from Tcl, as the entry widget does,
+and focus-out by calling the handler of the event, so this runs without a display. From the repository root:
+
+    PYTHONPATH=. python benchmarks/update_triggers.py
+"""
+import time
+import tkinter as tk
+
+from tkpf import ViewModel, Bindable, AutoProperty, Binding
+
+items = ['item {:05}'.format(i) for i in range(20000)]
+word = 'item 01234'
+
+
+class Search(ViewModel):
+    matches = Bindable(AutoProperty(list))
+    filterings = 0
+
+    def __init__(self):
+        self._query = ''
+        super().__init__()
+
+    @Bindable
+    @property
+    def query(self) -> str:
+        return self._query
+
+    @query.setter
+    def query(self, val):
+        self._query = val
+        self.matches = [item for item in items if val in item]
+        Search.filterings += 1
+
+
+def main():
+    root = tk._default_root = tk.Tcl()
+    print('{:>12} {:>12} {:>16} {:>12}'.format('trigger', 'filterings', 'usec/keystroke', 'ms/word'))
+    for trigger in (None, '20', 'focusout'):
+        model = Search()
+        binding = Binding(source=model, source_prop=Search.query, target=None, target_prop='textvariable',
+                          to_model=True, to_view=True, config_method=lambda **kwargs: None,
+                          update_trigger=trigger)
+        Search.query.subscriptions(model).bindings.add(binding)
+        name = str(binding.var)
+        Search.filterings = 0
+
+        start = time.perf_counter()
+        for i in range(1, len(word) + 1):
+            root.globalsetvar(name, word[:i])
+            root.update()  # The event processing between keystrokes
+        typing = time.perf_counter() - start
+        if trigger != 'focusout':
+            time.sleep(0.05)  # Wait out the debounce delay
+        start = time.perf_counter()
+        if trigger == 'focusout':
+            binding._on_commit_event(None)
+        else:
+            root.update()
+        total = typing + time.perf_counter() - start
+
+        assert model.query == word and len(model.matches) == 1
+        print('{:>12} {:>12} {:>16.1f} {:>12.2f}'.format(trigger or 'change', Search.filterings,
+                                                        typing / len(word) * 1e6, total * 1e3))
+        binding.unbind()
+
+
+if __name__ == '__main__':
+    main()
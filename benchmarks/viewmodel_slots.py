@@ -0,0 +1,77 @@
+""" Compares the memory per instance and the property access speed of viewmodels
+keeping their auto properties in the instance dictionary and in slots.
+
+Also checks that a property with a custom setter keeps it in slots.
+
+No Tk is involved. From the repository root:
+
+    PYTHONPATH=. python benchmarks/viewmodel_slots.py
+"""
+import timeit
+import tracemalloc
+
+from tkpf import ViewModel, Bindable, AutoProperty
+
+COUNT = 100000
+
+
+class DictRow(ViewModel):
+    id = AutoProperty(int)
+    name = Bindable(AutoProperty())
+    price = Bindable(AutoProperty(0.0))
+    quantity = Bindable(AutoProperty(0))
+
+
+class SlotsRow(ViewModel, slots=True):
+    id = AutoProperty(int)
+    name = Bindable(AutoProperty())
+    price = Bindable(AutoProperty(0.0))
+    quantity = Bindable(AutoProperty(0))
+
+
+class ClampedRow(ViewModel, slots=True):
+    quantity = Bindable(AutoProperty(0), always_notify=True)
+
+    @quantity.setter
+    def quantity(self, val):
+        ClampedRow.quantity.wrapped_property.fset(self, max(0, val))
+
+
+def check_custom_setter():
+    row = ClampedRow()
+    seen = []
+    ClampedRow.quantity.subscriptions(row).observers.append(lambda val, this: seen.append(val))
+    row.quantity = -5
+    if row.quantity != 0 or len(seen) != 1 or row._tkpf_slot_quantity != 0:
+        raise AssertionError('The custom setter of a slotted property was lost')
+    if not ClampedRow.quantity.always_notify or '__dict__' in dir(row):
+        raise AssertionError('The slotted property lost its attributes')
+
+
+def measure(cls):
+    tracemalloc.start()
+    rows = [cls() for _ in range(COUNT)]
+    size = tracemalloc.get_traced_memory()[0] / COUNT
+    tracemalloc.stop()
+
+    row = rows[0]
+    init = min(timeit.repeat(cls, number=10000, repeat=3)) / 10000 * 1e6
+    get = min(timeit.repeat(lambda: row.price, number=100000, repeat=3)) / 100000 * 1e6
+    get_auto = min(timeit.repeat(lambda: row.id, number=100000, repeat=3)) / 100000 * 1e6
+
+    def set_value():
+        row.quantity = 1
+    set_ = min(timeit.repeat(set_value, number=100000, repeat=3)) / 100000 * 1e6
+    return size, init, get, get_auto, set_
+
+
+def main():
+    check_custom_setter()
+    print('{:>8} {:>12} {:>10} {:>14} {:>15} {:>14}'.format(
+        '', 'bytes/row', 'usec/init', 'usec/get', 'usec/get auto', 'usec/set'))
+    for cls in (DictRow, SlotsRow):
+        print('{:>8} {:>12.0f} {:>10.3f} {:>14.3f} {:>15.3f} {:>14.3f}'.format(cls.__name__, *measure(cls)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+""" Opens and closes a bound window 10000 times under tracemalloc, and fails if memory keeps growing
+or bindings outlive their windows.
+
+Real windows are created, so this needs a display. Without one, it checks headless that views bound
+to Tcl variables and collections are garbage collected, both after being disposed and when just dropped.
+From the repository root:
+
+    PYTHONPATH=. python benchmarks/window_leak.py
+"""
+import gc
+import sys
+import tkinter as tk
+import tracemalloc
+import weakref
+
+from tkpf import Window, ViewModel, Bindable, AutoProperty, ObservableList
+from tkpf.Directive import Structural
+from tkpf.Window import _windows
+
+ITERATIONS = 10000
+WARMUP = 200
+MAX_GROWTH = 100  # Bytes per window, allowing for allocator noise
+
+
+class LeakModel(ViewModel):
+    title = Bindable(AutoProperty('title'))
+    count = Bindable(AutoProperty(int))
+    items = Bindable(AutoProperty(ObservableList))
+
+    async def refresh(self):
+        pass
+
+
+class LeakWindow(Window):
+    template = """
+    <Frame>
+        <Label text="[title]"/>
+        <Entry textvariable="[(title)]"/>
+        <Spinbox textvariable="[(count)]"/>
+        <OptionMenu values="[items]" variable="(title)"/>
+        <Button command="refresh">Refresh</Button>
+    </Frame>"""
+
+
+class HeadlessView(Structural):
+    """ A view without widgets, whose bindings target Tcl variables and a collection """
+
+    def __init__(self, model, nested=True):
+        super().__init__(None, None, model)
+        name = '.headless{}'.format(id(self))
+        self.bind('textvariable', '[(title)]', widget_name=name + '.entry', widget_classname='Entry')
+        self.bind('textvariable', '[count]', widget_name=name + '.label', widget_classname='Label')
+        self.bind('values', '[items]', widget_name=name + '.menu', widget_classname='OptionMenu',
+                  widget_config_method=self.config, widget_change_method=self.apply_change)
+        if nested:
+            self.child_directives.append(HeadlessView(model, nested=False))
+
+    def config(self, **kwargs):
+        pass
+
+    def apply_change(self, prop, change):
+        pass
+
+
+def headless_check():
+    tk._default_root = tk.Tcl()
+    model = LeakModel()
+    model.items.extend(['a', 'b', 'c'])
+    subscriptions = model._tkpf_subscriptions = {}
+    failures = []
+    for dispose in (True, False):
+        view = HeadlessView(model)
+        ref = weakref.ref(view)
+        model.title = 'changed'
+        if dispose:
+            view.dispose()
+        del view
+        gc.collect()
+        kind = 'disposed' if dispose else 'dropped'
+        if ref() is not None:
+            failures.append('a {} view is still alive'.format(kind))
+        if any(len(s.bindings) for s in subscriptions.values()):
+            failures.append('the bindings of a {} view are still subscribed'.format(kind))
+        if model.items.observers:
+            failures.append('the collection observers of a {} view are still registered'.format(kind))
+    print('Headless: {}'.format('; '.join(failures) or 'views are collected'))
+    for failure in failures:
+        print('FAIL: ' + failure)
+    return 1 if failures else 0
+
+
+def open_and_close(model):
+    window = LeakWindow(model)
+    window.parent_widget.update_idletasks()
+    window.parent_widget.destroy()
+
+
+def main():
+    try:
+        tk.Tk().destroy()
+    except tk.TclError as e:
+        print('No display, windows skipped: {}'.format(e))
+        return headless_check()
+
+    model = LeakModel()
+    model.items.extend(['a', 'b', 'c'])
+    main_window = LeakWindow(model)  # Keeps the Tk root alive, the others are Toplevels
+    main_window.parent_widget.withdraw()
+    subscriptions = model._tkpf_subscriptions
+
+    for _ in range(WARMUP):
+        open_and_close(model)
+    gc.collect()
+    bindings = {key: len(s.bindings) for key, s in subscriptions.items()}
+    observers = len(model.items.observers)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(ITERATIONS):
+        open_and_close(model)
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    growth = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    print('{} windows, {:+d} bytes ({:+.1f} per window)'.format(ITERATIONS, growth, growth / ITERATIONS))
+    for stat in after.compare_to(before, 'lineno')[:5]:
+        print('   ', stat)
+
+    failures = []
+    if growth / ITERATIONS > MAX_GROWTH:
+        failures.append('memory grows')
+    if {key: len(s.bindings) for key, s in subscriptions.items()} != bindings:
+        failures.append('bindings outlive their windows')
+    if len(model.items.observers) != observers:
+        failures.append('collection observers outlive their windows')
+    if len(_windows) != 1:
+        failures.append('{} windows are still tracked'.format(len(_windows)))
+    for failure in failures:
+        print('FAIL: ' + failure)
+    main_window.parent_widget.destroy()
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
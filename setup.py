@@ -8,6 +8,9 @@ setup(
     version='0.0.1',
     packages=find_packages(),
     install_requires=['pyyaml'],
+    entry_points={
+        'console_scripts': ['tkpf-codegen=tkpf.codegen:main'],
+    },
     long_description="""\
 tkpf is a library for building Tkinter GUIs in a paradigm influenced by WPF (Windows Presentation Foundation) and Angular.
 
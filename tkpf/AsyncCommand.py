@@ -0,0 +1,102 @@
+import functools
+import sys
+import tkinter as tk
+from tkinter import ttk
+
+from tkpf.AsyncLoop import AsyncLoop
+from tkpf.Dispatcher import Dispatcher
+
+_CO_COROUTINE = 0x80  # inspect.CO_COROUTINE
+
+
+class AsyncCommand:
+    """
+    Wraps an ``async def`` command handler. Invoking it runs the coroutine on the :class:`AsyncLoop`
+    and disables the invoking widget until the coroutine finishes, fails or gets cancelled.
+
+    The coroutine runs on the asyncio thread: setting bindable properties from it is safe,
+    but widgets should only be touched through ``ViewModel.invoke_on_ui``.
+    Its outcome is handled on the Tk thread: posted there by the current :class:`Dispatcher`,
+    or, without one, found by checking the future every ``poll_interval`` milliseconds.
+    """
+    poll_interval = 20
+
+    def __init__(self, fn, widget=None):
+        self.fn = fn
+        self.widget = widget
+        self.future = None
+        self._previous_state = None
+
+    @staticmethod
+    def is_async(fn):
+        # Command handlers are looked up while views are constructed, so this doesn't import asyncio or inspect.
+        # The asyncio version also recognizes generator based coroutines, which only exist if it was imported.
+        asyncio = sys.modules.get('asyncio')
+        if asyncio:
+            return asyncio.iscoroutinefunction(fn)
+        while isinstance(fn, functools.partial):
+            fn = fn.func
+        code = getattr(getattr(fn, '__func__', fn), '__code__', None)
+        return code is not None and bool(code.co_flags & _CO_COROUTINE)
+
+    @property
+    def running(self):
+        return self.future is not None and not self.future.done()
+
+    def __call__(self, *args):
+        if self.running:
+            return self.future
+        self._disable()
+        self.future = AsyncLoop.instance().submit(self.fn(*args))
+        dispatcher = Dispatcher.current
+        if dispatcher:
+            self.future.add_done_callback(lambda future: dispatcher.post(self._finish, future))
+        else:
+            # The done callbacks run on the asyncio thread, which must not touch Tk
+            self._poll(self.future)
+        return self.future
+
+    def cancel(self):
+        """ Cancel the running coroutine, if any """
+        if self.running:
+            self.future.cancel()
+
+    def _poll(self, future):
+        if future.done():
+            self._finish(future)
+        elif not isinstance(self.widget, tk.Misc):
+            tk._default_root.after(self.poll_interval, self._poll, future)
+        elif self._widget_exists():
+            self.widget.after(self.poll_interval, self._poll, future)
+        # Otherwise the view is gone, and disposing it has cancelled the coroutine
+
+    def _finish(self, future):
+        self._enable()
+        if not future.cancelled():
+            future.result()  # Re-raise the exception of the coroutine, if any, on the Tk thread
+
+    def _disable(self):
+        if isinstance(self.widget, ttk.Widget):
+            self._previous_state = self.widget.state(['disabled'])
+        elif isinstance(self.widget, tk.Widget) and 'state' in self.widget.keys():
+            self._previous_state = self.widget.cget('state')
+            self.widget.config(state='disabled')
+
+    def _widget_exists(self):
+        try:
+            return bool(self.widget.winfo_exists())
+        except tk.TclError:  # The whole application has been destroyed
+            return False
+
+    def _enable(self):
+        if self._previous_state is None:
+            return
+        if not self._widget_exists():
+            # Destroyed while the coroutine ran, e.g. with its window, which cancels the coroutine
+            self._previous_state = None
+            return
+        if isinstance(self.widget, ttk.Widget):
+            self.widget.state(self._previous_state)
+        else:
+            self.widget.config(state=self._previous_state)
+        self._previous_state = None
@@ -0,0 +1,61 @@
+import threading
+
+
+class AsyncLoop:
+    """
+    An asyncio event loop running on a background thread.
+    Coroutine command handlers run on it, so awaiting I/O never blocks Tk event processing.
+    Their outcomes are handed over to the Tk thread through the :class:`Dispatcher`.
+    """
+
+    _instance = None
+
+    @classmethod
+    def instance(cls) -> 'AsyncLoop':
+        """ Return the running loop, starting it first if needed """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def shutdown(cls):
+        """ Cancel the pending tasks and stop the loop, if it was started """
+        if cls._instance is not None:
+            cls._instance.stop()
+            cls._instance = None
+
+    def __init__(self):
+        import asyncio  # Only imported once a coroutine command runs, since it takes long to import
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, name='tkpf-asyncio', daemon=True)
+        self.thread.start()
+
+    def submit(self, coro):
+        """ Schedule a coroutine on the loop. Callable from any thread.
+
+        :return: a :class:`concurrent.futures.Future` of its result. Cancelling it cancels the coroutine.
+        """
+        import asyncio
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+    def _cancel_all(self):
+        """ Cancel the pending tasks, and run the loop until they have handled the cancellation """
+        import asyncio
+        tasks = asyncio.all_tasks(self.loop) if hasattr(asyncio, 'all_tasks') else asyncio.Task.all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+
+    def _run(self):
+        import asyncio
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+            self._cancel_all()
+        finally:
+            self.loop.close()
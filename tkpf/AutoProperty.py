@@ -1,5 +1,10 @@
 class AutoProperty(property):
-    def __init__(self, arg=str, name=None):
+    def __init__(self, arg=str, name=None, slot=None):
+        """
+        :param arg: the default value, or the data type if there is none
+        :param slot: the name of a slot to keep the value in,
+        instead of the instance dictionary (see the ``slots`` option of :class:`ViewModel`)
+        """
         self.name = name
 
         if isinstance(arg, type):
@@ -9,6 +14,14 @@ class AutoProperty(property):
             self.default_value = arg
             self.dtype = type(arg)
 
+        if slot is not None:
+            # Plain functions accessing the slot by name are the fastest to call from the Bindable wrappers
+            namespace = {}
+            exec('def getter(this):\n    return this.{0}\n\n'
+                 'def setter(this, val):\n    this.{0} = val\n'.format(slot), namespace)
+            super().__init__(namespace['getter'], namespace['setter'])
+            return
+
         def getter(this) -> self.dtype:
             return getattr(this, self.private_membername)
 
@@ -18,5 +31,14 @@ class AutoProperty(property):
         super().__init__(getter, setter)
 
     @property
-    def private_membername(self):
-        return '__' + self.name
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        self._name = name
+        self.private_membername = '__' + name if name else None
+
+    def with_slot(self, slot) -> 'AutoProperty':
+        """ Return a copy of this property that keeps its value in the given slot """
+        return AutoProperty(self.dtype if self.default_value is None else self.default_value, self.name, slot)
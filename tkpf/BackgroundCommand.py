@@ -0,0 +1,154 @@
+import functools
+import importlib
+import inspect
+import sys
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+
+from tkpf.AutoProperty import AutoProperty
+from tkpf.Bindable import Bindable
+from tkpf.Dispatcher import Dispatcher
+from tkpf.ViewModel import ViewModel
+
+
+class BackgroundStatus(ViewModel):
+    """ Standard bindable properties reflecting the state of the :class:`BackgroundCommand` methods of a viewmodel """
+    is_busy = Bindable(AutoProperty(False))
+    progress = Bindable(AutoProperty(0.0))
+    error = Bindable(AutoProperty())
+
+
+class BackgroundCommand:
+    """
+    Decorator for viewmodel methods that should run on an executor instead of the Tk thread.
+    Templates use them as command handlers like any other method::
+
+        class ParserModel(BackgroundStatus):
+            @BackgroundCommand(executor=ProcessPoolExecutor(), done='on_parsed')
+            def parse(self, progress):
+                ...
+
+    While the method runs, ``is_busy`` is true, and it can report its progress by calling ``progress``,
+    if it has a parameter of that name. Invoking it again meanwhile does nothing, but other background commands
+    of the viewmodel can run at the same time. When none of them runs any more, ``is_busy`` becomes false,
+    ``error`` is set to the exception it raised, if any, and the ``done`` method of the viewmodel
+    is called on the Tk thread with its return value. It is posted there by the current :class:`Dispatcher`,
+    or, without one, found by checking the future every ``poll_interval`` milliseconds.
+
+    On a :class:`ProcessPoolExecutor` the viewmodel gets pickled, and progress reports are discarded.
+    The method is looked up by its name in the worker process, so it cannot be defined inside a function.
+    """
+
+    default_executor = None  # Shared ThreadPoolExecutor for commands that don't specify one
+    poll_interval = 20
+    _busy = {}  # The number of background commands running for each viewmodel, by its id
+
+    def __init__(self, fn=None, executor=None, done=None):
+        self.executor = executor
+        self.done = done
+        self.fn = None
+        self._running = set()  # The ids of the viewmodels this command runs for
+        if fn:
+            self(fn)
+
+    def __call__(self, fn):
+        self.fn = fn
+        self.reports_progress = 'progress' in inspect.signature(fn).parameters
+        return self
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return functools.partial(self.run, instance)
+
+    def run(self, model, *args):
+        """ Start the command on its executor, unless it is already running for the viewmodel
+
+        :return: the :class:`concurrent.futures.Future` of the result, None if it is already running
+        """
+        if id(model) in self._running:
+            return None
+        executor = self.executor or self._default_executor()
+        in_process = _is_process_pool(executor)
+        if in_process and '<locals>' in self.fn.__qualname__:
+            raise TypeError('{} is defined inside a function, so it cannot run in another process'.format(
+                self.fn.__qualname__))
+        kwargs = {}
+        if self.reports_progress:
+            if in_process:
+                kwargs['progress'] = _discard_progress
+            else:
+                kwargs['progress'] = functools.partial(_report_progress, model)
+        self._running.add(id(model))
+        self._busy[id(model)] = self._busy.get(id(model), 0) + 1
+        self._set_status(model, is_busy=True, progress=0.0, error='')
+        if in_process:
+            future = executor.submit(_run_by_name, self.fn.__module__, self.fn.__qualname__, model, *args, **kwargs)
+        else:
+            future = executor.submit(self.fn, model, *args, **kwargs)
+        dispatcher = Dispatcher.current
+        if dispatcher:
+            future.add_done_callback(lambda future: dispatcher.post(self._finish, model, future))
+        elif tk._default_root is not None:
+            # The done callbacks run on the executor, which must not touch Tk
+            self._poll(model, future)
+        else:
+            # No Tk at all, so there is no Tk thread to finish on either
+            future.add_done_callback(functools.partial(self._finish, model))
+        return future
+
+    def _poll(self, model, future):
+        if future.done():
+            self._finish(model, future)
+        else:
+            tk._default_root.after(self.poll_interval, self._poll, model, future)
+
+    def _finish(self, model, future):
+        self._running.discard(id(model))
+        busy = self._busy.pop(id(model)) - 1
+        if busy:
+            self._busy[id(model)] = busy
+        error = future.exception()
+        self._set_status(model, is_busy=bool(busy), error='' if error is None else str(error) or type(error).__name__)
+        if error is not None and not hasattr(model, 'error'):
+            raise error
+        if error is None and self.done:
+            getattr(model, self.done)(future.result())
+
+    @staticmethod
+    def _set_status(model, **values):
+        for name, val in values.items():
+            if hasattr(type(model), name):
+                setattr(model, name, val)
+
+    @staticmethod
+    def _default_executor():
+        if BackgroundCommand.default_executor is None:
+            BackgroundCommand.default_executor = ThreadPoolExecutor()
+        return BackgroundCommand.default_executor
+
+
+def _is_process_pool(executor):
+    # Importing ProcessPoolExecutor imports multiprocessing, which is only worth it if it is already in use
+    process = sys.modules.get('concurrent.futures.process')
+    return process is not None and isinstance(executor, process.ProcessPoolExecutor)
+
+
+def _run_by_name(module, qualname, *args, **kwargs):
+    """ Call the function of a background command in a worker process.
+    Functions are pickled by their qualified names, which refer to the command instead, so it is looked up here. """
+    fn = importlib.import_module(module)
+    for name in qualname.split('.'):
+        fn = getattr(fn, name)
+    if isinstance(fn, BackgroundCommand):
+        fn = fn.fn
+    return fn(*args, **kwargs)
+
+
+def _report_progress(model, val):
+    if hasattr(type(model), 'progress'):
+        model.progress = val
+
+
+def _discard_progress(val):
+    pass
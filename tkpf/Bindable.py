@@ -1,33 +1,226 @@
+import threading
 import typing
+import weakref
+from threading import get_ident
+
+from tkpf.AutoProperty import AutoProperty
+from tkpf.Dispatcher import Dispatcher
+
+
+class WeakList:
+    """ A list of weakly referenced objects. They drop out of it when they are garbage collected. """
+    __slots__ = ('refs', '__weakref__')
+
+    def __init__(self):
+        self.refs = []
+
+    def add(self, item):
+        self.refs.append(weakref.ref(item, self._on_collected))
+
+    def remove(self, item):
+        for i, ref in enumerate(self.refs):
+            if ref() is item:
+                del self.refs[i]
+                return
+        raise ValueError('{!r} is not in the list'.format(item))
+
+    def _on_collected(self, ref):
+        try:
+            self.refs.remove(ref)
+        except ValueError:
+            pass
+
+    def __iter__(self):
+        for ref in self.refs:
+            item = ref()
+            if item is not None:
+                yield item
+
+    def __len__(self):
+        return len(self.refs)
+
+
+class Subscriptions:
+    """ The bindings and observers of one bindable property on one instance,
+    and the Tcl variables shared by its bindings.
+    Bindings are only referenced weakly: they live as long as the directive that created them. """
+    __slots__ = ('bindings', 'observers', 'variables')
+
+    def __init__(self):
+        self.bindings = WeakList()
+        self.observers = []
+        self.variables = {}
+
+
+class _Reads(threading.local):
+    """ The stack of dependency sets of the computed properties being evaluated on the current thread """
+    def __init__(self):
+        self.stack = []
+
+
+reads = _Reads()
+batches = {}  # Properties changed during a batch update, by the ID of the instance being updated
+_unset = object()
+_value_types = frozenset((bool, int, float, complex, str, bytes, type(None)))  # Compared by value when set
 
 
 class Bindable(property):
-    def __init__(self, *args):
+    def __init__(self, *args, deferred=None, max_rate=None, always_notify=False):
+        """
+        :param deferred: whether the view updates of bindings to this property should be coalesced and applied
+        once per Tk idle cycle. By default this is decided by the ``deferred_updates`` attribute of the viewmodel.
+        :param max_rate: the maximum number of view updates per second of bindings to this property.
+        Implies ``deferred``.
+        :param always_notify: notify the bindings even if the property is set to a value equal to its current one.
+        By default that is skipped for numbers, strings and ``None``. Other values are always notified,
+        because they may have been changed in place. Setting an :class:`AutoProperty` to an equal value
+        is skipped altogether, but other setters, such as custom ones, always run for their side effects,
+        and only the notification is skipped if the value read back is equal to the previous one.
+        """
+        self.deferred = deferred
+        self.max_rate = max_rate
+        self.always_notify = always_notify
+        self.custom_getter = None  # The functions given to getter() and setter(), replacing those of the wrapped property
+        self.custom_setter = None
         if len(args) == 1:
             wrapped_prop = args[0]
-            super().__init__(wrapped_prop.fget, self.wrap_setter(wrapped_prop.fset), wrapped_prop.fdel)
             self.wrapped_property = wrapped_prop
-            self.bindings = []
-            self.observers = []
-            self.dtype = typing.get_type_hints(wrapped_prop.fget)['return']
+            super().__init__(self.wrap_getter(wrapped_prop.fget),
+                             self.wrap_setter(wrapped_prop.fset, stores_only=isinstance(wrapped_prop, AutoProperty)),
+                             wrapped_prop.fdel)
+            self.key = self
+            self.dtype = getattr(wrapped_prop, 'dtype', None) or typing.get_type_hints(wrapped_prop.fget)['return']
         else:
             super().__init__(*args)
 
+    def subscriptions(self, this) -> Subscriptions:
+        """
+        Return the bindings and observers of this property on the given instance.
+        They are indexed on the instance itself, so notifying them never has to look at other instances.
+        """
+        index = getattr(this, '_tkpf_subscriptions', None)
+        if index is None:
+            index = this._tkpf_subscriptions = {}
+        try:
+            return index[self.key]
+        except KeyError:
+            ret = index[self.key] = Subscriptions()
+            return ret
+
     def notify_bindings(self, val, this):
-        for binding in self.bindings:
-            binding.notify_to_view(val, this)
-        for observer in self.observers:
-            observer(val, this)
+        index = getattr(this, '_tkpf_subscriptions', None)
+        subscriptions = index and index.get(self.key)
+        if subscriptions:
+            for ref in subscriptions.bindings.refs:
+                binding = ref()
+                if binding is not None:
+                    binding.notify_to_view(val, this)
+            for observer in subscriptions.observers:
+                observer(val, this)
+
+    def record_read(self, this):
+        """ Record this property of the given instance as a dependency of the computed property being evaluated """
+        stack = reads.stack
+        if stack:
+            stack[-1][self.key, id(this)] = self, this
+
+    def wrap_getter(self, fget):
+        def wrapped_getter(this):
+            if reads.stack:
+                self.record_read(this)
+            return fget(this)
+        return wrapped_getter
+
+    def notify_changed(self, this):
+        """ Notify the bindings and observers of the current value of this property on the given instance """
+        dispatcher = Dispatcher.current
+        if dispatcher is None or dispatcher.thread_id == get_ident():
+            self.notify_bindings(self.fget(this), this)
+        else:
+            dispatcher.post_notification(self, this)
+
+    def wrap_setter(self, fset, stores_only=False):
+        """ Wrap a setter to notify the bindings and observers
+
+        :param stores_only: whether the setter only stores the value, so it can be skipped if that is unchanged
+        """
+        fget = self.custom_getter or self.wrapped_property.fget
+        if not stores_only:
+            return self._wrap_custom_setter(fset, fget)
+
+        def wrapped_setter(this, val):
+            if not self.always_notify and type(val) in _value_types:
+                try:
+                    old = fget(this)
+                except AttributeError:  # Not initialized yet
+                    pass
+                else:
+                    if old == val and type(old) is type(val):
+                        return
+            fset(this, val)
+            if batches and id(this) in batches:
+                batches[id(this)][self.key] = self
+                return
+            dispatcher = Dispatcher.current
+            if dispatcher is None or dispatcher.thread_id == get_ident():
+                self.notify_bindings(val, this)
+            else:
+                dispatcher.post_notification(self, this)
+        return wrapped_setter
 
-    def wrap_setter(self, fset):
+    def _wrap_custom_setter(self, fset, fget):
         def wrapped_setter(this, val):
+            try:
+                old = fget(this)
+            except AttributeError:  # Not initialized yet
+                old = _unset
             fset(this, val)
-            self.notify_bindings(val, this)
+            try:
+                new = fget(this)
+            except AttributeError:  # The setter did not store anything
+                return
+            if not self.always_notify and type(new) in _value_types and old == new and type(old) is type(new):
+                return
+            if batches and id(this) in batches:
+                batches[id(this)][self.key] = self
+                return
+            dispatcher = Dispatcher.current
+            if dispatcher is None or dispatcher.thread_id == get_ident():
+                self.notify_bindings(new, this)
+            else:
+                dispatcher.post_notification(self, this)
         return wrapped_setter
 
+    def getter(self, fget):
+        ret = super().getter(self.wrap_getter(fget))
+        self._copy_attributes(ret)
+        ret.custom_getter = fget
+        if ret.custom_setter is not None:
+            # Its setter reads the value back through the new getter
+            ret = ret.setter(ret.custom_setter)
+        return ret
+
     def setter(self, fset):
         ret = super().setter(self.wrap_setter(fset))
-        ret.wrapped_property = self.wrapped_property
-        ret.bindings = self.bindings
-        ret.dtype = self.dtype
+        self._copy_attributes(ret)
+        ret.custom_setter = fset
+        return ret
+
+    def _copy_attributes(self, other):
+        for attr, value in vars(self).items():
+            setattr(other, attr, value)
+
+    def with_slot(self, slot) -> 'Bindable':
+        """ Return a copy of this property whose wrapped :class:`AutoProperty` keeps its value in the given slot,
+        with the same custom getter, setter and other attributes """
+        # The wrapped setters refer to the property they were wrapped by, so it needs the settings already
+        ret = Bindable(self.wrapped_property.with_slot(slot),
+                       deferred=self.deferred, max_rate=self.max_rate, always_notify=self.always_notify)
+        if self.custom_getter is not None:
+            ret = ret.getter(self.custom_getter)
+        if self.custom_setter is not None:
+            ret = ret.setter(self.custom_setter)
+        for attr, value in vars(self).items():
+            if attr not in ('wrapped_property', 'key', 'dtype'):
+                setattr(ret, attr, value)
         return ret
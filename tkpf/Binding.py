@@ -1,8 +1,12 @@
 import tkinter as tk
+import weakref
 from typing import Callable
 from warnings import warn
 
 from tkpf import Bindable
+from tkpf.ObservableList import Action, CollectionChange, Observable
+from tkpf.Scheduler import Scheduler
+from tkpf.TclBatch import TclBatch
 from tkpf.ViewModel import ViewModel
 
 _type_mapping = {
@@ -12,58 +16,362 @@ _type_mapping = {
     float: tk.DoubleVar
 }
 
+# The events of the target widget that write the changes of its variable to the model, by update trigger
+_commit_events = {
+    'focusout': ('<FocusOut>',),
+    'return': ('<Return>', '<KP_Enter>'),
+}
+_unknown = object()
+
 
 class Binding:
     def __init__(self,
                  source: ViewModel, source_prop: Bindable,
                  target: tk.Widget, target_prop: str,
                  to_model: bool, to_view: bool,
-                 config_method: Callable=None):
+                 config_method: Callable=None,
+                 deferred: bool=None, max_rate: float=None,
+                 change_method: Callable=None, update_trigger: str=None, path=None):
+        """
+        :param change_method: if the value of the source property is an observable collection,
+        its changes are passed to this method as ``change_method(target_prop, change)``
+        instead of reconfiguring the target with the whole collection.
+        :param deferred: coalesce view updates and apply them once per Tk idle cycle, see :class:`Scheduler`.
+        Defaults to the setting of the source property, then that of the viewmodel.
+        :param max_rate: the maximum number of view updates per second. Implies ``deferred``.
+        :param update_trigger: when the changes of the variable of a binding to the model get written to it,
+        see :meth:`parse_update_trigger`. By default, on every change.
+        :param path: the :class:`BindingPath` the source is at the end of, if any.
+        If a None breaks the path, the source is None, and the binding starts suspended until the path is complete.
+        """
         self.source = source
         self.source_property = source_prop
-        self.var = _type_mapping[source_prop.dtype]()
         self.target = target
         self.target_property = target_prop
-        self.var.set(source_prop.fget(source))
         self.to_view = to_view
         self.to_model = to_model
-        self._subscribe_to_var(self.notify_to_model)
+        self.path = path
+        if path is not None:
+            path.binding = self
+        self.suspended = source is None
+        self._shown = _unknown  # The value the view was last updated with, while suspended
+        self.max_rate = max_rate or source_prop.max_rate or getattr(source, 'max_update_rate', None)
+        if deferred is None:
+            deferred = source_prop.deferred
+        if deferred is None:
+            deferred = getattr(source, 'deferred_updates', False)
+        if deferred or self.max_rate:
+            # The root of the widget, since tkinter's default root may be disabled or not created yet
+            self.scheduler = Scheduler.of(target._root() if isinstance(target, tk.Misc) else tk._default_root)
+        else:
+            self.scheduler = None
+        self.update_delay, self.commit_events = self.parse_update_trigger(update_trigger) if to_model else (None, ())
+        self._commit_bindings = []  # The event sequences bound to commit the edits, with the IDs of the handlers
 
-        if 'variable' not in target_prop:
-            if not config_method:
-                config_method = target.config
-            if to_view:
-                self._subscribe_to_var(lambda val: config_method(**{target_prop: val}))
+        if 'variable' in target_prop:
+            if source is None:
+                # A variable of its own for the widget, until there is a source to share one for
+                self.shared = None
+                self.var = _type_mapping[source_prop.dtype]()
+            else:
+                self.shared = SharedVariable.acquire(self)
+                self.var = self.shared.var
+            self.config_method = config_method
+            if self.commit_events and target is not None:
+                if TclBatch.commands:
+                    # The widget may only get created when the collected commands are evaluated
+                    with TclBatch.recording(target):
+                        self._bind_commit_events()
+                else:
+                    self._bind_commit_events()
+        else:
+            # Other properties are configured directly, so they don't need a Tcl variable
+            # and can take any Python value
+            self.var = None
+            self.config_method = config_method or target.config
+            self.change_method = change_method
+            self.observed = None
+            self._observe(source_prop.fget(source) if source is not None else None)
             if to_model:
                 warn('Property "{}" is not a variable: binding back to model not supported'.format(target_prop))
 
-    def _subscribe_to_var(self, observer):
+    @staticmethod
+    def parse_update_trigger(trigger) -> tuple:
         """
-        Register a callback to be called when the value of ``self.var`` changes
-        :param observer: a callable accepting one parameter. The new value will be passed in that.
+        Parse an update trigger: ``change`` to update the model on every change, a number of milliseconds
+        to update it once the changes stop for that long, ``focusout`` to update it when the widget loses focus,
+        or ``return`` to update it when Return is pressed in the widget. They can be combined with commas,
+        e.g. ``500,focusout``.
+
+        :return: the delay in milliseconds, or None, and the event sequences that update the model right away
         """
+        delay, events = None, ()
+        for word in str(trigger or '').split(','):
+            word = word.strip().lower()
+            if word.endswith('ms') and word[:-2].isdigit():
+                word = word[:-2]
+            if word.isdigit():
+                delay = int(word)
+            elif word in _commit_events:
+                events += _commit_events[word]
+            elif word not in ('', 'change'):
+                raise ValueError('Unknown update trigger "{}"'.format(word))
+        return delay, events
+
+    def _bind_commit_events(self):
+        for sequence in self.commit_events:
+            self._commit_bindings.append((sequence, self.target.bind(sequence, self._on_commit_event, add='+')))
+
+    def _unbind_commit_events(self):
+        # Widget.unbind would also drop the other handlers of the sequence, before Python 3.13
+        for sequence, funcid in self._commit_bindings:
+            try:
+                script = self.target.bind(sequence)
+                self.target.bind(sequence, '\n'.join(line for line in script.split('\n') if funcid not in line))
+                self.target.deletecommand(funcid)
+            except tk.TclError:  # The widget has been destroyed, and its handlers with it
+                pass
+        self._commit_bindings.clear()
+
+    def _on_commit_event(self, _):
+        if self.shared is not None and self.shared.users:
+            self.shared.commit()
+
+    def safe_get(self):
+        return self.shared.safe_get()
+
+    def notify_to_view(self, val, source):
+        if self.to_view and self.source is source:
+            if self.scheduler:
+                self.scheduler.schedule(self, val)
+            else:
+                self.update_view(val)
+
+    def update_view(self, val):
+        if self.var is not None:
+            self.shared.set(val)
+        else:
+            self._observe(val)
+            self.config_method(**{self.target_property: val})
+
+    def _observe(self, val):
+        """ Follow the changes of the collection that is the current value of the source property """
+        if not self.change_method or val is self.observed:
+            return
+        if self.observed is not None:
+            self.observed.observers.remove(self._observer)
+            self.observed = None
+        if isinstance(val, Observable):
+            # The collection must not keep the view alive
+            self._observer = WeakObserver(self.on_collection_changed, val.observers)
+            val.observers.append(self._observer)
+            self.observed = val
+
+    def on_collection_changed(self, change: CollectionChange):
+        if not self.to_view:
+            return
+        if change.action == Action.RESET:
+            self.config_method(**{self.target_property: self.observed})
+        else:
+            self.change_method(self.target_property, change)
+
+    def suspend(self):
+        """ Stop updating the view, e.g. while it is hidden, until :meth:`resume` """
+        if self.suspended:
+            return
+        self.suspended = True
+        self.source_property.subscriptions(self.source).bindings.remove(self)
+        if self.scheduler:
+            self.scheduler.discard(self)
+        if self.var is None:
+            # The changes of an observed collection are not followed either, so it has to be shown again
+            self._shown = _unknown if self.observed is not None else self.source_property.fget(self.source)
+            self._observe(None)
+
+    def resume(self):
+        """ Update the view again, after bringing it up to date with the source if it changed meanwhile """
+        if not self.suspended or self.path is not None and self.path.broken:
+            return
+        self.suspended = False
+        self.source_property.subscriptions(self.source).bindings.add(self)
+        if not self.to_view:
+            return
+        val = self.source_property.fget(self.source)
+        if self.var is not None:
+            self.shared.set(val)  # No-op if another binding kept the variable up to date
+        elif val is not self._shown:
+            self.update_view(val)
+        self._shown = _unknown
+
+    def unbind(self):
+        """ Detach this binding from its source, so that it is not updated any more """
+        if not self.suspended:
+            self.source_property.subscriptions(self.source).bindings.remove(self)
+        if self.var is None:
+            self._observe(None)
+        elif self.shared is not None:
+            self.shared.release(self)
+        if self._commit_bindings:
+            self._unbind_commit_events()
+        if self.scheduler:
+            self.scheduler.discard(self)
+        if self.path is not None:
+            self.path.detach()
+
+    def rebind(self, source):
+        """ Point this binding to the same property of another source instance, and refresh the view.
+        If the binding has a :class:`BindingPath`, the path is followed from ``source`` instead. """
+        if self.path is not None:
+            self.path.rebase(source)
+        else:
+            self.set_source(source)
+
+    def set_source(self, source):
+        """ Point this binding to the same property of another source instance, and refresh the view.
+        A suspended binding only refreshes it when it is resumed. """
+        if not self.suspended:
+            self.source_property.subscriptions(self.source).bindings.remove(self)
+            self.source_property.subscriptions(source).bindings.add(self)
+        self.source = source
+        if self.var is None:
+            if self.suspended:
+                self._shown = _unknown
+            else:
+                self.update_view(self.source_property.fget(source))
+        else:
+            if self.shared is not None:
+                self.shared.release(self)
+            self.shared = SharedVariable.acquire(self)
+            self.var = self.shared.var
+            (self.config_method or self.target.config)(**{self.target_property: self.var})
+
+    @staticmethod
+    def is_binding_expr(s):
+        if not isinstance(s, str):
+            return False
+        s = s.partition('@')[0]
+        return s.startswith('[') and s.endswith(']') or s.startswith('(') and s.endswith(')')
+
+
+class WeakObserver:
+    """ Calls a bound method without keeping its object alive,
+    and removes itself from the list of observers when the object is gone """
+    __slots__ = ('method', 'observers', '__weakref__')
+
+    def __init__(self, method, observers: list):
+        self.method = weakref.WeakMethod(method, self._on_collected)
+        self.observers = observers
+
+    def __call__(self, *args):
+        method = self.method()
+        if method is not None:
+            method(*args)
+
+    def _on_collected(self, _):
+        try:
+            self.observers.remove(self)
+        except ValueError:
+            pass
+
+
+class SharedVariable:
+    """
+    The Tcl variable of the variable bindings of one bindable property on one instance.
+    Bindings with the same direction and update settings share it, so it is only set once per change,
+    and its single write trace sets the property once, no matter how many widgets display it.
+
+    With an update trigger, the writes of the variable only get committed to the property after a delay,
+    or when the bindings sharing it call :meth:`commit` on the trigger events of their widgets.
+    """
+    __slots__ = ('key', 'subscriptions', 'source', 'source_property', 'to_model', 'var', 'value', 'users',
+                 'delay', 'deferred_commit', '_writing', '_trace', '_timer')
+
+    @classmethod
+    def acquire(cls, binding: Binding) -> 'SharedVariable':
+        """ Return the variable for the binding, creating it if it does not exist yet """
+        subscriptions = binding.source_property.subscriptions(binding.source)
+        key = (binding.to_model, binding.to_view, binding.scheduler is not None, binding.max_rate,
+               binding.update_delay, binding.commit_events)
+        shared = subscriptions.variables.get(key)
+        if shared is None:
+            shared = subscriptions.variables[key] = cls(key, subscriptions, binding)
+        shared.users += 1
+        return shared
+
+    def __init__(self, key, subscriptions, binding):
+        self.key = key
+        self.subscriptions = subscriptions
+        self.source = binding.source
+        self.source_property = binding.source_property
+        self.to_model = binding.to_model
+        self.var = _type_mapping[binding.source_property.dtype]()
+        self.value = binding.source_property.fget(binding.source)
+        self.users = 0
+        self.delay = binding.update_delay
+        self.deferred_commit = self.delay is not None or bool(binding.commit_events)
+        self._writing = False
+        self._timer = None
+        self.var.set(self.value)
         if hasattr(self.var, 'trace_add'):
-            self.var.trace_add('write', lambda *_: observer(self.safe_get()))
+            self._trace = self.var.trace_add('write', self._on_write)
         else:
-            self.var.trace('w', lambda *_: observer(self.safe_get()))
+            self._trace = self.var.trace('w', self._on_write)
+
+    def release(self, binding):
+        """ Drop the variable when the last binding sharing it does not need it any more """
+        self.users -= 1
+        if not self.users:
+            if self._timer is not None:
+                self.commit()  # Don't lose the last edit
+            del self.subscriptions.variables[self.key]
+            if hasattr(self.var, 'trace_remove'):
+                self.var.trace_remove('write', self._trace)
+            else:
+                self.var.trace_vdelete('w', self._trace)
 
     def safe_get(self):
+        dtype = self.source_property.dtype
         try:
-            return self.source_property.dtype(self.var.get())
+            val = self.var.get()
         except tk.TclError:
-            return self.source_property.dtype()
+            return dtype()
+        # The Tk variable classes already convert to their own type
+        return val if type(val) is dtype else dtype(val)
 
-    def notify_to_model(self, val):
-        if self.to_model:
-            self.source_property.bindings.remove(self)
-            self.source_property.fset(self.source, val)
-            self.source_property.bindings.append(self)
-
-    def notify_to_view(self, val, source):
-        if self.to_view and self.source is source:
+    def set(self, val):
+        if val == self.value:
+            return
+        self.value = val
+        self._writing = True
+        try:
             self.var.set(val)
+        finally:
+            self._writing = False
 
-    @staticmethod
-    def is_binding_expr(s):
-        return isinstance(s, str) and (s.startswith('[') and s.endswith(']') or s.startswith('(') and s.endswith(')'))
+    def _on_write(self, *_):
+        if self._writing:
+            return
+        if not self.deferred_commit:
+            self.commit()
+        elif self.delay is not None:
+            # Every write restarts the delay
+            if self._timer is not None:
+                tk._default_root.after_cancel(self._timer)
+            self._timer = tk._default_root.after(self.delay, self._on_timer)
 
+    def _on_timer(self):
+        self._timer = None
+        self.commit()
+
+    def commit(self):
+        """ Set the property to the value of the variable, if it changed """
+        if self._timer is not None:
+            tk._default_root.after_cancel(self._timer)
+            self._timer = None
+        val = self.safe_get()
+        if val == self.value:
+            return
+        # Remember the value first, so the notification of the bindings sharing this variable is no-op
+        self.value = val
+        if self.to_model:
+            self.source_property.fset(self.source, val)
@@ -0,0 +1,147 @@
+import weakref
+
+from tkpf.Bindable import Bindable
+
+
+class BindingPath:
+    """
+    A dotted binding path like ``customer.address.city``, followed from a viewmodel to the instance
+    whose bindable property at the end of the path a :class:`Binding` is attached to.
+
+    The properties along a path are looked up once per viewmodel class. The bindable ones are observed:
+    when one of them changes, only the rest of the path after it is followed again, and the binding is
+    rebound to the new end. While a None breaks the path, the binding is suspended.
+    """
+    _compiled = {}  # The links of each path, by viewmodel class and path
+
+    @classmethod
+    def compile(cls, model_type: type, expr: str) -> tuple:
+        """
+        The links of a path as (name, bindable property) pairs. The property is None if it is not bindable,
+        or if the class it is on is only known when the path is followed.
+        """
+        key = model_type, expr
+        try:
+            return cls._compiled[key]
+        except KeyError:
+            pass
+        links = []
+        typ = model_type
+        for name in expr.split('.'):
+            member = getattr(typ, name, None) if typ is not None else None
+            if not isinstance(member, Bindable):
+                member = None
+            links.append((name, member))
+            typ = member.dtype if member is not None and isinstance(member.dtype, type) else None
+        ret = cls._compiled[key] = tuple(links)
+        return ret
+
+    def __init__(self, model, expr: str):
+        self.expr = expr
+        self.links = self.compile(type(model), expr)
+        self.sources = [model] + [None] * (len(self.links) - 1)  # The instance each link is read from
+        self.observers = [None] * (len(self.links) - 1)
+        self.binding = None
+        self._follow(0)
+        self.broken = self.source is None
+
+        name, self.source_property = self.links[-1]
+        if self.source_property is None and self.source is not None:
+            self.source_property = self._bindable(self.source, name)
+        if self.source_property is None:
+            raise AttributeError('"{}" is not a bindable property of {}'.format(expr, type(model)))
+
+    @property
+    def source(self):
+        """ The instance at the end of the path, None if the path is broken """
+        return self.sources[-1]
+
+    def rebase(self, model):
+        """ Follow the path from another viewmodel """
+        self.sources[0] = model
+        self._follow(0)
+        self._retarget()
+
+    def detach(self):
+        """ Stop following the path """
+        for i in range(len(self.observers)):
+            self._unobserve(i)
+        self.binding = None
+
+    def on_link_changed(self, index, val):
+        if val is self.sources[index + 1]:
+            return
+        self.sources[index + 1] = val
+        self._follow(index + 1)
+        self._retarget()
+
+    @staticmethod
+    def _bindable(source, name):
+        member = getattr(type(source), name, None)
+        return member if isinstance(member, Bindable) else None
+
+    def _follow(self, start):
+        """ Read the path from its link ``start`` on, observing the bindable properties along it """
+        for i in range(start, len(self.observers)):
+            self._unobserve(i)
+            source = self.sources[i]
+            if source is None:
+                self.sources[i + 1] = None
+                continue
+            name, prop = self.links[i]
+            if prop is None:
+                prop = self._bindable(source, name)
+            if prop is None:
+                # Not bindable, so it cannot change
+                self.sources[i + 1] = getattr(source, name)
+                continue
+            link = self.observers[i] = _Link(self, i, prop, source)
+            prop.subscriptions(source).observers.append(link)
+            self.sources[i + 1] = prop.fget(source)
+
+    def _unobserve(self, index):
+        link = self.observers[index]
+        if link is not None:
+            self.observers[index] = None
+            link.remove()
+
+    def _retarget(self):
+        binding = self.binding
+        if binding is None:
+            return
+        source = self.source
+        if source is None:
+            if not self.broken:
+                self.broken = True
+                binding.suspend()
+            return
+        if source is not binding.source:
+            binding.set_source(source)
+        if self.broken:
+            self.broken = False
+            binding.resume()
+
+
+class _Link:
+    """ Observes one bindable property along a path, on one instance, without keeping the path alive """
+    __slots__ = ('path', 'index', 'prop', 'source')
+
+    def __init__(self, path, index, prop, source):
+        self.path = weakref.ref(path, self._on_collected)
+        self.index = index
+        self.prop = prop
+        self.source = source
+
+    def __call__(self, val, this):
+        path = self.path()
+        if path is not None:
+            path.on_link_changed(self.index, val)
+
+    def remove(self):
+        try:
+            self.prop.subscriptions(self.source).observers.remove(self)
+        except ValueError:
+            pass
+
+    def _on_collected(self, _):
+        self.remove()
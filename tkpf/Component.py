@@ -1,10 +1,10 @@
-import xml.etree.ElementTree as Xml
-import yaml
+import importlib
 from typing import Union
 import tkinter as tk
 
 from tkpf import Directive
-from tkpf import parser
+from tkpf import template
+from tkpf.TclBatch import TclBatch
 
 
 class Component(Directive.Structural):
@@ -13,42 +13,63 @@ class Component(Directive.Structural):
     template = None
     template_path = None
     template_yaml = None
+    template_module = None  # A module generated by tkpf.codegen, or its name, used instead of the template
 
     def __init__(self, parent_widget, parent_directive, model=None, **_):
         super().__init__(parent_widget, parent_directive, model)
-        self.bindings = {}
 
     def create(self, parent, **_):
-        tree = self.parsed_template()
-        if tree is not None:
-            if isinstance(parent, tk.Wm):
-                return self.construct(tree, parent)
-            else:
-                root_widget = tk.Frame(parent, name=type(self).__name__.lower() + str(self._counter))
-                type(self)._counter += 1
-                self.construct(tree, root_widget)
-                return root_widget
+        build = self.compiled_template()
+        if build is None:
+            tree = self.parsed_template()
+            if tree is None:
+                return None
+            build = lambda view, parent_widget: view.construct(tree, parent_widget)
+        if isinstance(parent, tk.Wm):
+            return build(self, parent)
+        else:
+            root_widget = tk.Frame(parent, name=type(self).__name__.lower() + str(self._counter))
+            type(self)._counter += 1
+            build(self, root_widget)
+            return root_widget
+
+    def compiled_template(self):
+        """ The ``build`` function of the generated template module of this component, if it has one """
+        module = self.template_module
+        if module is None:
+            return None
+        if isinstance(module, str):
+            from tkpf import codegen
+            codegen.install_import_hook()
+            module = type(self).template_module = importlib.import_module(module)
+        return module.build
 
     def parsed_template(self):
-        if self.template:
-            return parser.wrap(Xml.fromstring(self.template))
-        elif self.template_yaml:            
-            return parser.wrap(yaml.load(self.template_yaml))
-        elif self.template_path:
-            if self.template_path.lower().endswith('.xml'):
-                return parser.wrap(Xml.parse(self.template_path))
-            elif self.template_path.lower().endswith('.yaml'):
-                with open(self.template_path) as bf:
-                    return parser.wrap(yaml.load(bf))
-        raise Exception('Component template not specified')
+        """ The compiled template of this component, see :func:`tkpf.template.load` """
+        return template.load(type(self))
 
     def construct(self, elem, parent: Union[tk.Widget, tk.Wm]):
         ret = super().construct(elem, parent)
 
         if isinstance(ret, tk.Widget):
-            if any(ch.winfo_manager() == 'grid' for ch in ret.children.values()):
-                columns = ret.grid_size()
-                for i in range(columns[0]):
-                    ret.grid_columnconfigure(i, weight=1)
+            if TclBatch.commands:
+                # The children may not exist yet, so they are checked in Tcl
+                self.weight_grid_columns(ret)
+            elif any(ch.winfo_manager() == 'grid' for ch in ret.children.values()):
+                self.weight_grid_columns(ret)
 
         return ret
+
+    @staticmethod
+    def weight_grid_columns(widget):
+        """ Make the grid columns of the widget share its extra width evenly.
+        While Tcl commands are being batched, this is batched too, see :class:`TclBatch`. """
+        if TclBatch.commands:
+            TclBatch.weight_grid_columns(widget)
+            return
+        columns = widget.grid_size()
+        for i in range(columns[0]):
+            widget.grid_columnconfigure(i, weight=1)
+
+
+Directive.Structural.batching_constructs.add(Component.construct)
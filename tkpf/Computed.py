@@ -0,0 +1,161 @@
+import typing
+import weakref
+
+from tkpf.Bindable import Bindable, batches, reads
+from tkpf.Dispatcher import Dispatcher
+
+_unset = object()
+
+
+class _State:
+    """ The cached value and the dependencies of one computed property on one instance """
+    __slots__ = ('value', 'valid', 'notified', 'dependencies', 'pending')
+
+    def __init__(self):
+        self.value = None
+        self.valid = False
+        self.notified = _unset  # The value the bindings last got
+        self.dependencies = {}  # (property, instance, invalidator) by (property key, instance ID)
+        self.pending = False
+
+
+class _Invalidator:
+    """ Observer of a dependency, marks the computed property it belongs to out of date.
+    It does not keep the instance of the computed property alive, and stops observing when that is collected. """
+    __slots__ = ('computed', 'ref', 'prop', 'source')
+
+    def __init__(self, computed, this, prop, source):
+        self.computed = computed
+        self.ref = weakref.ref(this, self._on_collected)
+        self.prop = prop
+        self.source = source
+
+    def __call__(self, val, source):
+        this = self.ref()
+        if this is not None:
+            self.computed.invalidate(this)
+
+    def _on_collected(self, _):
+        try:
+            self.prop.subscriptions(self.source).observers.remove(self)
+        except ValueError:
+            pass
+
+
+class Computed(Bindable):
+    """
+    A read-only bindable property whose value is derived from other bindable properties::
+
+        @Computed
+        def total(self) -> float:
+            return self.price * self.quantity
+
+    The bindable (or computed) properties read by the function are recorded as its dependencies.
+    The value is cached per instance, and the function only runs again when it is read
+    after one of the dependencies changed. Bindings to a computed property are updated once per Tk idle cycle
+    after its dependencies changed, and only if the result is different.
+    """
+
+    def __init__(self, fget, deferred=None, max_rate=None):
+        """
+        :param fget: the function computing the value. Annotate its return type if you bind it to a Tk variable.
+        """
+        super().__init__(self._get, None, None, fget.__doc__, deferred=deferred, max_rate=max_rate)
+        self.function = fget
+        self.wrapped_property = None
+        self.key = self
+        self.dtype = typing.get_type_hints(fget).get('return', str)
+
+    def state(self, this) -> _State:
+        try:
+            index = this._tkpf_computed
+        except AttributeError:
+            index = this._tkpf_computed = {}
+        try:
+            return index[self.key]
+        except KeyError:
+            ret = index[self.key] = _State()
+            return ret
+
+    def _get(self, this):
+        if reads.stack:
+            self.record_read(this)
+        state = self.state(this)
+        if not state.valid:
+            self._evaluate(this, state)
+        return state.value
+
+    def _evaluate(self, this, state):
+        dependencies = {}
+        reads.stack.append(dependencies)
+        try:
+            state.value = self.function(this)
+        finally:
+            reads.stack.pop()
+        state.valid = True
+        if state.notified is _unset:
+            state.notified = state.value
+
+        # Subscribe to the new dependencies only, and unsubscribe from the ones no longer read
+        previous = state.dependencies
+        state.dependencies = {}
+        for key, (prop, source) in dependencies.items():
+            dependency = previous.pop(key, None)
+            if dependency is None:
+                dependency = prop, source, _Invalidator(self, this, prop, source)
+                prop.subscriptions(source).observers.append(dependency[2])
+            state.dependencies[key] = dependency
+        for prop, source, invalidator in previous.values():
+            prop.subscriptions(source).observers.remove(invalidator)
+
+    def invalidate(self, this):
+        """ Mark the value out of date, and schedule the update of the bindings if there are any """
+        state = self.state(this)
+        if not state.valid:
+            return
+        state.valid = False
+
+        index = getattr(this, '_tkpf_subscriptions', None)
+        subscriptions = index and index.get(self.key)
+        if not subscriptions:
+            return
+        # Dependent computed properties are out of date as well, but they are only evaluated when needed
+        for observer in subscriptions.observers:
+            if isinstance(observer, _Invalidator):
+                observer(None, this)
+        if state.pending or not (subscriptions.bindings or any(
+                not isinstance(observer, _Invalidator) for observer in subscriptions.observers)):
+            return
+        if id(this) in batches:
+            batches[id(this)][self.key] = self
+            return
+        if Dispatcher.current:
+            state.pending = True
+            Dispatcher.current.root.after_idle(self.refresh, this)
+        else:
+            self.refresh(this)
+
+    def refresh(self, this):
+        """ Recompute the value if it is out of date, and notify the bindings if it changed """
+        state = self.state(this)
+        state.pending = False
+        val = self._get(this)
+        if val != state.notified:
+            state.notified = val
+            self.notify_bindings(val, this)
+
+    def notify_changed(self, this):
+        self.refresh(this)
+
+    def notify_bindings(self, val, this):
+        # Dependent computed properties have already been invalidated
+        index = getattr(this, '_tkpf_subscriptions', None)
+        subscriptions = index and index.get(self.key)
+        if subscriptions:
+            for ref in subscriptions.bindings.refs:
+                binding = ref()
+                if binding is not None:
+                    binding.notify_to_view(val, this)
+            for observer in subscriptions.observers:
+                if not isinstance(observer, _Invalidator):
+                    observer(val, this)
@@ -0,0 +1,290 @@
+import bisect
+import functools
+import sys
+from tkinter import ttk
+
+from tkpf import Directive
+from tkpf.ObservableList import Action
+
+_placeholder = '\x00placeholder'
+
+
+class DataGrid(Directive.Structural):
+    """
+    Displays a collection of viewmodels bound to ``items`` in a ``ttk.Treeview``, one row per viewmodel.
+    The child ``Column`` elements name the bindable property displayed in each column::
+
+        <DataGrid items="[people]" key="id" subitems="reports" sort="name">
+            <Column property="name" width="200">Name</Column>
+            <Column property="age" anchor="e">Age</Column>
+        </DataGrid>
+
+    Rows are identified by the ``key`` property of their viewmodels, or by identity if there is none,
+    so that assigning a new collection only inserts, deletes, moves and updates the rows that differ.
+    Changes of an :class:`ObservableList` and of the displayed properties of each viewmodel
+    are applied to the affected rows only.
+
+    If ``subitems`` names a property of the row viewmodels, rows can be expanded,
+    and their child rows are only loaded when that happens.
+
+    Sorting (``sort``, or clicking a heading) and filtering (``filter``, a predicate of a row viewmodel)
+    reorder and detach the existing rows instead of reinserting them.
+    """
+
+    def __init__(self, parent_widget, parent_directive, model=None):
+        self.items = ()
+        self.key = None
+        self.children_property = None
+        self.columns = []
+        self.sort_property = None
+        self.sort_descending = False
+        self.filter = None
+        self.rows = {}  # Row viewmodels by item ID
+        self.order = []  # Item IDs of the top level rows, in collection order
+        self.displayed = []  # Item IDs of the top level rows, in display order
+        self._observers = {}  # Cell observers by item ID
+        self._loaded = {}  # Item IDs of the loaded child rows by the item ID of their parent
+        self._appended = []  # Item IDs of the top level rows inserted at the end since the last reordering
+        self._constructed = False
+        super().__init__(parent_widget, parent_directive, model)
+
+    def create(self, parent):
+        tree = ttk.Treeview(parent, show='headings')
+        tree.bind('<<TreeviewOpen>>', self._on_open)
+        return tree
+
+    def construct(self, elem, parent):
+        if elem.name != 'Column':
+            raise AttributeError('DataGrid can only contain Column elements, not "{}"'.format(elem.name))
+        options = dict(elem.options)
+        prop = options.pop('property')
+        self.columns.append((prop, options))
+        return None
+
+    def on_constructed(self):
+        tree = self.root_widget
+        columns = [prop for prop, _ in self.columns]
+        if self.children_property:
+            # The first column goes to the tree column, which has the expander
+            tree.config(columns=columns[1:], show='tree headings')
+            columns[0] = '#0'
+        else:
+            tree.config(columns=columns)
+        for column, (prop, options) in zip(columns, self.columns):
+            heading = options.pop('text', prop)
+            tree.heading(column, text=heading, command=functools.partial(self._on_heading, prop))
+            if options:
+                tree.column(column, **options)
+        self._constructed = True
+        self._sync()
+
+    def config(self, **kwargs):
+        if 'key' in kwargs:
+            self.key = kwargs.pop('key')
+        if 'subitems' in kwargs:
+            self.children_property = kwargs.pop('subitems')
+        reorder = False
+        if 'sort' in kwargs:
+            self.sort_property = kwargs.pop('sort')
+            reorder = True
+        if 'filter' in kwargs:
+            self.filter = kwargs.pop('filter')
+            reorder = True
+        if 'items' in kwargs:
+            items = kwargs.pop('items')
+            # An emptied observable list is kept, its later changes refer to it
+            self.items = () if items is None else items
+            self._sync()
+        elif reorder:
+            self._reorder()
+        super().config(**kwargs)
+
+    @property
+    def named_widgets(self):
+        return self.parent_directive.named_widgets
+
+    def sort_by(self, prop, descending=False):
+        """ Sort the rows by a property of the row viewmodels, or restore collection order if it is ``None`` """
+        self.sort_property = prop
+        self.sort_descending = descending
+        self._reorder()
+
+    def filter_by(self, predicate):
+        """ Only display the rows whose viewmodel satisfies the predicate, or all if it is ``None`` """
+        self.filter = predicate
+        self._reorder()
+
+    def unbind(self):
+        super().unbind()
+        for iid in list(self._observers):
+            self._unsubscribe(iid)
+
+    def apply_change(self, prop, change):
+        """ Apply the change of a bound observable list to the affected rows only """
+        if prop != 'items' or not self._constructed:
+            return
+        if change.action == Action.MOVE:
+            self.order.insert(change.new_index, self.order.pop(change.index))
+        else:
+            old_ids = self.order[change.index:change.index + len(change.old_items)]
+            new_ids = [self._item_id(row) for row in change.items]
+            kept = set(new_ids)
+            self._delete([iid for iid in old_ids if iid not in kept])
+            for iid, row in zip(new_ids, change.items):
+                self._put(iid, row)
+            self.order[change.index:change.index + len(change.old_items)] = new_ids
+        self._reorder()
+
+    def _sync(self):
+        """ Diff the bound collection against the rows by key, and apply only the differences """
+        if not self._constructed:
+            return
+        new_order = [self._item_id(row) for row in self.items]
+        kept = set(new_order)
+        self._delete([iid for iid in self.order if iid not in kept])
+        for iid, row in zip(new_order, self.items):
+            self._put(iid, row)
+        self.order = new_order
+        self._reorder()
+
+    def _reorder(self):
+        """ Bring the displayed rows in line with the filter and the sort order, with as few moves as possible """
+        if not self._constructed:
+            return
+        wanted = self.order
+        if self.filter:
+            wanted = [iid for iid in wanted if self.filter(self.rows[iid])]
+        if self.sort_property:
+            wanted = sorted(wanted, key=lambda iid: getattr(self.rows[iid], self.sort_property),
+                            reverse=self.sort_descending)
+        if wanted == self.displayed and not self._appended:
+            return
+
+        # Rows that are already in the right relative order stay, the rest get detached and moved into place
+        position = {iid: i for i, iid in enumerate(self.displayed + self._appended)}
+        stable = _increasing_subsequence([position.get(iid, -1) for iid in wanted])
+        stable_ids = {wanted[i] for i in stable}
+        wanted_set = set(wanted)
+        detached = [iid for iid in position if iid not in wanted_set or iid not in stable_ids]
+
+        tree = self.root_widget
+        if detached:
+            tree.detach(*detached)
+        for index, iid in enumerate(wanted):
+            if iid not in stable_ids:
+                tree.move(iid, '', index)
+        self.displayed = wanted
+        self._appended = []
+
+    def _item_id(self, row, parent=''):
+        key = getattr(row, self.key) if self.key else id(row)
+        return '{}/{}'.format(parent, key) if parent else str(key)
+
+    def _values(self, row):
+        values = [getattr(row, prop) for prop, _ in self.columns]
+        if self.children_property:
+            return {'text': values[0], 'values': values[1:]}
+        return {'values': values}
+
+    def _put(self, iid, row, parent=''):
+        """ Insert a row, or update it if it exists but now belongs to another viewmodel """
+        previous = self.rows.get(iid)
+        if previous is row:
+            return
+        tree = self.root_widget
+        if previous is None:
+            tree.insert(parent, 'end', iid=iid, **self._values(row))
+            if not parent:
+                self._appended.append(iid)
+            if self.children_property:
+                tree.insert(iid, 'end', iid=iid + _placeholder)
+        else:
+            self._unsubscribe(iid)
+            tree.item(iid, **self._values(row))
+        self.rows[iid] = row
+        self._subscribe(iid, row)
+
+    def _delete(self, iids):
+        if not iids:
+            return
+        self._forget(iids)
+        self.root_widget.delete(*iids)
+        deleted = set(iids)
+        self.displayed = [iid for iid in self.displayed if iid not in deleted]
+        self._appended = [iid for iid in self._appended if iid not in deleted]
+
+    def _forget(self, iids):
+        for iid in iids:
+            self._forget(self._loaded.pop(iid, ()))
+            self._unsubscribe(iid)
+            del self.rows[iid]
+
+    def _subscribe(self, iid, row):
+        observers = []
+        for column, (prop, _) in enumerate(self.columns):
+            source_property = getattr(type(row), prop, None)
+            if hasattr(source_property, 'subscriptions'):
+                observer = functools.partial(self._on_cell_changed, iid, column)
+                source_property.subscriptions(row).observers.append(observer)
+                observers.append((source_property, observer))
+        self._observers[iid] = observers
+
+    def _unsubscribe(self, iid):
+        row = self.rows[iid]
+        for source_property, observer in self._observers.pop(iid, ()):
+            source_property.subscriptions(row).observers.remove(observer)
+
+    def _on_cell_changed(self, iid, column, val, _):
+        tree = self.root_widget
+        if self.children_property and column == 0:
+            tree.item(iid, text=val)
+        else:
+            tree.set(iid, self.columns[column][0], val)
+        if self.sort_property == self.columns[column][0] and '/' not in iid:
+            self._reorder()
+
+    def _on_heading(self, prop):
+        descending = self.sort_property == prop and not self.sort_descending
+        self.sort_by(prop, descending)
+
+    def _on_open(self, _):
+        """ Load the children of a row the first time it is expanded """
+        tree = self.root_widget
+        iid = tree.focus()
+        if not tree.exists(iid + _placeholder):
+            return
+        tree.delete(iid + _placeholder)
+        self._loaded[iid] = []
+        for child in getattr(self.rows[iid], self.children_property) or ():
+            child_iid = self._item_id(child, iid)
+            self._put(child_iid, child, parent=iid)
+            self._loaded[iid].append(child_iid)
+
+
+def _increasing_subsequence(seq) -> list:
+    """ Return the indices of a longest strictly increasing subsequence of the non-negative elements of seq """
+    tails = []  # Smallest tail value of an increasing subsequence of each length
+    tail_indices = []
+    previous = [None] * len(seq)
+    for i, val in enumerate(seq):
+        if val < 0:
+            continue
+        length = bisect.bisect_left(tails, val)
+        if length:
+            previous[i] = tail_indices[length - 1]
+        if length == len(tails):
+            tails.append(val)
+            tail_indices.append(i)
+        else:
+            tails[length] = val
+            tail_indices[length] = i
+    ret = []
+    i = tail_indices[-1] if tail_indices else None
+    while i is not None:
+        ret.append(i)
+        i = previous[i]
+    return ret[::-1]
+
+
+if sys.version_info < (3, 6):
+    Directive.Registry.register(DataGrid)
@@ -1,11 +1,15 @@
+import functools
+import importlib
 from copy import copy
 from typing import Union
 import tkinter as tk
 from tkinter import ttk
 
+from tkpf import template
+from tkpf.AsyncCommand import AsyncCommand
 from tkpf.Binding import Binding
-from tkpf.NumericEntry import NumericEntry
-from tkpf.OptionMenu import OptionMenu
+from tkpf.BindingPath import BindingPath
+from tkpf.TclBatch import TclBatch
 
 
 _variable_counterparts = {
@@ -19,18 +23,59 @@ _variable_counterparts = {
 }
 
 
+class _LazyRegistry(dict):
+    """ A registry that looks names up the first time they are used: built-in classes in the modules defining them,
+    which are imported then, and anything else in the given namespaces """
+
+    def __init__(self, builtins, namespaces=()):
+        super().__init__()
+        self.builtins = builtins  # Module names by class name, taking precedence over the namespaces
+        self.namespaces = namespaces  # Modules, searched in order
+
+    def __missing__(self, key):
+        module = self.builtins.get(key)
+        if module is not None:
+            typ = getattr(importlib.import_module(module), key)
+            # Directive modules register themselves while they are imported
+            return self.setdefault(key, typ)
+        for namespace in self.namespaces:
+            if key in vars(namespace):
+                return self.setdefault(key, vars(namespace)[key])
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        if super().__contains__(key):
+            return True
+        try:
+            return self[key] is not None
+        except KeyError:
+            return False
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+
 class Registry:
-    widgets = copy(tk.__dict__)
-    widgets.update(ttk.__dict__)
-    widgets.update({'NumericEntry': NumericEntry, 'OptionMenu': OptionMenu})
-    directives = {}
+    widgets = _LazyRegistry({
+        'NumericEntry': 'tkpf.NumericEntry',
+        'OptionMenu': 'tkpf.OptionMenu',
+    }, (ttk, tk))
+    directives = _LazyRegistry({
+        'Menu': 'tkpf.Menu',
+        'Notebook': 'tkpf.Notebook',
+        'Fragment': 'tkpf.Fragment',
+        'ItemsControl': 'tkpf.ItemsControl',
+        'DataGrid': 'tkpf.DataGrid',
+        'Switch': 'tkpf.Switch',
+        'If': 'tkpf.Switch',
+    })
 
     @classmethod
     def register(cls, typ: type):
         name = typ.__name__
         if issubclass(typ, Directive):
             cls.directives[name] = typ
-        elif issubclass(cls, tk.Widget):
+        elif issubclass(typ, tk.Widget):
             cls.widgets[name] = typ
 
 
@@ -39,18 +84,36 @@ class Directive:
 
 
 class Structural(Directive):
+    # The construct methods that leave the plain widgets they construct alone until the construction is over
+    batching_constructs = set()
+
     @classmethod
     def __init_subclass__(cls):
         super().__init_subclass__()
         Registry.register(cls)
 
+    @classmethod
+    def batches_construction(cls) -> bool:
+        """ Whether the Tcl commands for the plain widgets constructed by this directive can be batched,
+        see :class:`TclBatch`. Not if the class changes how elements are constructed, since it might use them
+        right away. """
+        return cls.construct in Structural.batching_constructs and all(
+            getattr(cls, name) is getattr(Structural, name) for name in ('add_element', 'add_child', 'inflate'))
+
     def __init__(self, parent_widget, parent_directive, model=None):
         self.parent_widget = parent_widget
         self.parent_directive = parent_directive
         self.model = model
         self.bindings = {}
+        self.async_commands = {}
+        self.child_directives = []
+        self.viewmodel_expr = None  # The tkpf-model attribute its model was selected with
         self._named_widgets = {}
+        TclBatch.flush()  # The directive code must see real widgets, and so must the code after it
         self.root_widget = self.create(parent_widget)
+        TclBatch.flush()
+        if isinstance(self.root_widget, tk.Misc):
+            self.root_widget.bind('<Destroy>', self._on_destroy, add='+')
 
     @property
     def named_widgets(self):
@@ -68,27 +131,80 @@ class Structural(Directive):
         :return: the root widget of the newly created view hierarchy
         """
 
+    def on_constructed(self):
+        """ Called when the element of this directive and all of its children have been constructed """
+
     def construct(self, elem, parent: Union[tk.Widget, tk.Wm]):
         """
-        Given a parsed template and a parent widget, construct the view hierarchy,
+        Given a compiled template and a parent widget, construct the view hierarchy,
         with the given widget as its parent
 
-        :param elem: the parsed template
+        :param elem: the compiled template, see :mod:`tkpf.template`
         :param parent: the parent widget
         :return: the newly constructed view hierarchy, in the form of its root widget or directive
         """
-
-        text = None
-        if elem.text and elem.text.strip():
-            text = elem.text.strip()
-
-        directive, widget = self.add_child(parent, elem.name, elem.attrib, text)
-
-        for child in elem.children:
-            (directive or self).construct(child, widget)
+        if not isinstance(elem, template.Node):
+            elem = template.compile_tree(elem)
+
+        TclBatch.depth += 1
+        try:
+            directive, widget = self.add_element(parent, elem)
+
+            for child in elem.children:
+                (directive or self).construct(child, widget)
+            if directive:
+                TclBatch.flush()
+                directive.on_constructed()
+        except BaseException:
+            TclBatch.discard()
+            raise
+        finally:
+            TclBatch.depth -= 1
+        if not TclBatch.depth:
+            TclBatch.flush()
 
         return directive or widget
 
+    def add_element(self, parent, elem) -> tuple:
+        """ Execute one element of a compiled template, using its precomputed attribute classification.
+        Directives that override :meth:`add_child` get called with the raw attributes instead. """
+        if type(self).add_child is not Structural.add_child:
+            return self.add_child(parent, elem.name, dict(elem.attrib), elem.text)
+
+        batched = bool(TclBatch.depth) and type(self).batches_construction() \
+            and TclBatch.can_record(Registry.widgets.get(elem.name)) and elem.name not in Registry.directives
+        directive, widget = self.inflate(parent, elem.name,
+                                         widget_name=elem.widget_name,
+                                         viewmodel_expr=elem.viewmodel_expr,
+                                         options=elem.options if batched else None)
+        config_method = directive.config if directive else None
+        change_method = getattr(directive or widget, 'apply_change', None)
+        config_args = {} if batched else dict(elem.options)
+        for key, name in elem.commands:
+            config_args[key] = self.resolve_command(name, widget)
+        for key, binding_expr in elem.bindings:
+            config_args.update(self.bind(key, binding_expr, widget, widget_config_method=config_method,
+                                           widget_change_method=change_method))
+        if directive:
+            # Directives also get their custom hyphenated attributes, which can be bound as well
+            for prefix, group in elem.extra.items():
+                for key, value in group.items():
+                    key = prefix + '-' + key
+                    if Binding.is_binding_expr(value):
+                        config_args.update(self.bind(key, value, widget, widget_config_method=config_method,
+                                                                   widget_change_method=change_method))
+                    else:
+                        config_args[key] = value
+        layout_args = elem.layout_args
+        if layout_args and any(Binding.is_binding_expr(value) for value in layout_args.values()):
+            layout_args = self.bind_layout(widget, elem.layout, layout_args)
+        if batched:
+            with TclBatch.recording(widget):
+                self.configure(widget, config_args, elem.layout, layout_args)
+        else:
+            self.configure(widget, config_args, elem.layout, layout_args, config_method)
+        return directive, widget
+
     def add_child(self, parent, classname, attrib, text=None) -> tuple:
         """ This method gets called when, during tree traversal, this directive contains a child element.
         This method should decide what to do with that child, and return (if applicable)
@@ -101,21 +217,25 @@ class Structural(Directive):
         self.process_attributes(widget, self.resolve_bindings(widget, attrib))
         return directive, widget
 
-    def inflate(self, parent, classname, widget_name=None, viewmodel_expr=None):
-        """ Find and instantiate one widget or directive class, attaching it to the given widget as parent """
+    def inflate(self, parent, classname, widget_name=None, viewmodel_expr=None, options=None):
+        """ Find and instantiate one widget or directive class, attaching it to the given widget as parent.
 
-        if classname in Registry.directives:
-            if viewmodel_expr:
-                viewmodel = getattr(self.model, viewmodel_expr[1:-1])
-            else:
-                viewmodel = self.model
+        :param options: configuration options of a widget, passed to its constructor.
+        If they are given, its construction is collected into the current :class:`TclBatch`.
+        """
 
+        if classname in Registry.directives:
             cls = Registry.directives[classname]
-            directive = cls(parent, self, model=viewmodel)
+            directive = cls(parent, self, model=self.viewmodel(self.model, viewmodel_expr))
+            directive.viewmodel_expr = viewmodel_expr
             widget = directive.root_widget
+            self.child_directives.append(directive)
         elif classname in Registry.widgets:
             cls = Registry.widgets[classname]
-            widget = cls(parent, name=widget_name)
+            if options is None:
+                widget = cls(parent, name=widget_name)
+            else:
+                widget = TclBatch.create(cls, parent, name=widget_name, **options)
             directive = None
         else:
             raise AttributeError('Component or widget "{}" does not exist or was not registered'.format(classname))
@@ -125,6 +245,12 @@ class Structural(Directive):
 
         return directive, widget
 
+    @staticmethod
+    def viewmodel(model, viewmodel_expr=None):
+        """ The model of a directive inside a directive with the given model,
+        selected by the ``tkpf-model`` attribute of its element, if it has one """
+        return getattr(model, viewmodel_expr[1:-1]) if viewmodel_expr else model
+
     def command_lookup(self, name):
         cur = self
         while cur and not hasattr(cur, name):
@@ -136,17 +262,40 @@ class Structural(Directive):
         else:
             raise AttributeError('Event handler "{}" not found'.format(name))
 
+    def resolve_command(self, name, widget=None):
+        """ Look up a command handler. Coroutine functions get wrapped in an :class:`AsyncCommand`,
+        which can be cancelled through ``self.async_commands[name]``. """
+        handler = self.command_lookup(name)
+        if AsyncCommand.is_async(handler):
+            handler = self.async_commands[name] = AsyncCommand(handler, widget)
+        return handler
+
     def resolve_bindings(self, widget, attrib, **kwargs):
         """ Take a dictionary of attributes and replace command and data binding expressions with
         actual references """
         ret = copy(attrib)
         for key, name in attrib.items():
             if 'command' in key:
-                ret[key] = self.command_lookup(name)
+                ret[key] = self.resolve_command(name, widget)
             elif Binding.is_binding_expr(name):
                 ret.update(self.bind(key, name, widget, **kwargs))
         return ret
 
+    def bind_layout(self, widget, layout, layout_args) -> dict:
+        """ Replace the binding expressions among the arguments of the geometry manager of a widget with their values.
+        Their bindings lay the widget out again when they change. """
+        ret = dict(layout_args)
+        relayout = functools.partial(self._relayout, widget, layout)
+        for key, value in layout_args.items():
+            if Binding.is_binding_expr(value):
+                for target, val in self.bind(layout + '-' + key, value, widget, widget_config_method=relayout).items():
+                    ret[target.split('-', 1)[1]] = val
+        return ret
+
+    @staticmethod
+    def _relayout(widget, layout, **kwargs):
+        getattr(widget, layout)(**{key.split('-', 1)[1]: value for key, value in kwargs.items()})
+
     @staticmethod
     def process_attributes(widget, attrib):
         config_args = {k: v for k, v in attrib.items() if '-' not in k}
@@ -154,27 +303,40 @@ class Structural(Directive):
         grid_args = {k[5:]: v for k, v in attrib.items() if k.startswith('grid-')}
         place_args = {k[6:]: v for k, v in attrib.items() if k.startswith('place-')}
 
-        widget.config(**config_args)
         if grid_args:
-            widget.grid(**grid_args)
+            Structural.configure(widget, config_args, 'grid', grid_args)
         elif place_args:
-            widget.place(**place_args)
-        elif not isinstance(widget, tk.Menu):
-            widget.pack(**pack_args)
+            Structural.configure(widget, config_args, 'place', place_args)
+        else:
+            Structural.configure(widget, config_args, 'pack', pack_args)
+
+    @staticmethod
+    def configure(widget, config_args, layout, layout_args, config_method=None):
+        """ Apply configuration options and geometry management to a widget.
+        The options go to ``config_method`` instead of the widget if it is given. """
+        if config_method:
+            config_method(**config_args)
+        elif config_args:
+            widget.config(**config_args)  # Without arguments, this would query all the options instead
+        if layout != 'pack' or not isinstance(widget, tk.Menu):
+            getattr(widget, layout)(**layout_args)
 
     def bind(self, target_property, binding_expr,
              widget=None, widget_name=None,
-             widget_classname=None, widget_config_method=None) -> dict:
+             widget_classname=None, widget_config_method=None, widget_change_method=None) -> dict:
         """
         Create a binding
 
         :param target_property: the name of the property that we're binding to
-        :param binding_expr: the binding expression
+        :param binding_expr: the binding expression, optionally followed by ``@`` and an update trigger,
+        see :meth:`Binding.parse_update_trigger`
         :param widget: the Tkinter object
         :param widget_name: the name of the Tkinter object
         :param widget_classname: the classname of the Tkinter object
         :param widget_config_method: the method that should be invoked by the binding in the case of a
         non-variable target property
+        :param widget_change_method: the method that should be invoked by the binding with the changes
+        of an observable collection bound to a non-variable target property
         :return: a dictionary that should be passed to the config method to finally create the binding
         """
         to_view = False
@@ -184,13 +346,19 @@ class Structural(Directive):
             if not widget_name:
                 widget_name = str(widget)
 
+        binding_expr, _, update_trigger = binding_expr.partition('@')
         if binding_expr.startswith('[') and binding_expr.endswith(']'):
             binding_expr = binding_expr[1:-1]
             to_view = True
         if binding_expr.startswith('(') and binding_expr.endswith(')'):
             binding_expr = binding_expr[1:-1]
             to_model = True
-        if hasattr(type(self.model), binding_expr):
+        path = None
+        source = self.model
+        if '.' in binding_expr:
+            path = BindingPath(self.model, binding_expr)
+            source, source_property = path.source, path.source_property
+        elif hasattr(type(self.model), binding_expr):
             source_property = getattr(type(self.model), binding_expr)
         else:
             raise AttributeError('{} has no attribute "{}"'.format(type(self.model), binding_expr))
@@ -198,28 +366,89 @@ class Structural(Directive):
         if (widget_classname, target_property) in _variable_counterparts:
             original_target = target_property
             target_property = _variable_counterparts[widget_classname, target_property]
-        binding = Binding(source=self.model, source_prop=source_property,
+        binding = Binding(source=source, source_prop=source_property,
                           target=widget, target_prop=target_property,
                           to_model=to_model, to_view=to_view,
-                          config_method=widget_config_method)
+                          config_method=widget_config_method,
+                          change_method=widget_change_method,
+                          update_trigger=update_trigger or None, path=path)
 
         # Unsubscribe previous binding
         binding_key = widget_name + '.Tkpf_targetprop:' + binding.target_property
         if binding_key in self.bindings:
-            previous = self.bindings.pop(binding_key)
-            previous.source_property.bindings.remove(previous)
+            self.bindings.pop(binding_key).unbind()
 
         # Subscribe new binding
         self.bindings[binding_key] = binding
-        source_property.bindings.append(binding)
+        if source is not None:
+            source_property.subscriptions(source).bindings.add(binding)
 
         if 'variable' in target_property:
             ret = {target_property: binding.var}
             if original_target:
                 ret[original_target] = None
             return ret
+        elif source is None:
+            return {}  # The path is broken, the widget is left alone until it is complete
         else:
-            return {target_property: getattr(self.model, binding_expr)}
+            return {target_property: source_property.fget(source)}
+
+    def unbind(self):
+        """ Detach the bindings of this directive and of the directives inside it from their sources """
+        for binding in self.bindings.values():
+            binding.unbind()
+        self.bindings.clear()
+        for directive in self.child_directives:
+            directive.unbind()
+
+    def rebind(self, model):
+        """ Switch all bindings of this directive and of the directives inside it over to another model
+        of the same type. The directives inside get their models from it the same way as when constructed. """
+        self.model = model
+        for binding in self.bindings.values():
+            binding.rebind(model)
+        for directive in self.child_directives:
+            directive.rebind(self.viewmodel(model, directive.viewmodel_expr))
+
+    def suspend(self):
+        """ Stop updating the views of the bindings of this directive and of the directives inside it,
+        e.g. while they are hidden, until :meth:`resume` """
+        for binding in self.bindings.values():
+            binding.suspend()
+        for directive in self.child_directives:
+            directive.suspend()
+
+    def resume(self):
+        """ Update the views of the bindings again, refreshing those whose sources changed meanwhile """
+        # Own bindings first: they may rebind the directives inside, which then only refresh once
+        for binding in self.bindings.values():
+            binding.resume()
+        for directive in self.child_directives:
+            directive.resume()
+
+    def dispose(self):
+        """ Detach the bindings, cancel the running asynchronous commands and forget the widgets of this directive
+        and of the directives inside it. This happens automatically when its root widget is destroyed. """
+        for directive in self.child_directives:
+            directive.dispose()
+        self.child_directives.clear()
+        self.unbind()
+        for command in self.async_commands.values():
+            command.cancel()
+        self.async_commands.clear()
+        self._named_widgets.clear()
+
+    def _on_destroy(self, event):
+        # The event is also delivered for the descendants of toplevel widgets
+        if str(event.widget) == str(self.root_widget):
+            self.dispose()
 
     def config(self, **kwargs):
-        pass
+        """ Receives the attributes of the element of this directive, including custom hyphenated ones,
+        and the updates of their bindings. By default, the non-hyphenated ones are passed on to the root widget. """
+        options = {k: v for k, v in kwargs.items() if '-' not in k}
+        if options:
+            self.root_widget.config(**options)
+
+
+Structural.batching_constructs.add(Structural.construct)
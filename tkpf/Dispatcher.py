@@ -0,0 +1,144 @@
+import os
+import sys
+import threading
+import tkinter as tk
+from collections import deque
+
+
+class Dispatcher:
+    """
+    Runs work posted from any thread on the Tk thread.
+
+    Posting appends to a deque, which is thread safe without locking.
+    The first post to an empty queue schedules a drain ``poll_interval`` milliseconds later,
+    so the work posted in the meantime is drained in the same batch.
+    Within a batch, only the last notification of each bindable property of each instance is delivered.
+    Nothing is scheduled while the queue stays empty.
+
+    Worker threads do not call Tk to schedule the drain, because that would wait for the Tk thread.
+    They wake it up by writing to a pipe that Tk watches instead.
+    Where Tk cannot watch files (on Windows), the queue is polled every ``poll_interval`` milliseconds.
+    """
+
+    current = None  # The dispatcher of the Tk thread, if one has been installed
+    poll_interval = 10
+    batch_size = 10000
+
+    @classmethod
+    def install(cls, root) -> 'Dispatcher':
+        """ Create the dispatcher for the given Tk root and make it current. Must be called on the Tk thread. """
+        cls.current = cls(root)
+        return cls.current
+
+    def __init__(self, root):
+        self.root = root
+        self.thread_id = threading.get_ident()
+        self.queue = deque()
+        self._after_id = None
+        self._lock = threading.Lock()
+        self._scheduled = False  # Whether a drain is scheduled or about to be
+        self._pipe = None
+        if hasattr(root.tk, 'createfilehandler'):
+            self._pipe = os.pipe()
+            os.set_blocking(self._pipe[1], False)
+            root.tk.createfilehandler(self._pipe[0], tk.READABLE, self._on_wake)
+        else:
+            self._scheduled = True
+            self._poll()
+
+    def is_ui_thread(self):
+        return threading.get_ident() == self.thread_id
+
+    def post(self, fn, *args):
+        """ Schedule ``fn(*args)`` to be called on the Tk thread """
+        self.queue.append((None, fn, args))
+        self._wake()
+
+    def post_notification(self, prop, this):
+        """ Schedule the notification of the bindings of a bindable property on the Tk thread.
+        They get the value the property has at that time, so they cannot end up out of date
+        when several threads race to set it. """
+        self.post_keyed((prop.key, id(this)), self._notify, prop, this)
+
+    def post_keyed(self, key, fn, *args):
+        """ Schedule ``fn(*args)`` to be called on the Tk thread,
+        unless other work is posted with the same key before the next drain, which replaces it """
+        self.queue.append((key, fn, args))
+        self._wake()
+
+    def invoke(self, fn, *args):
+        """ Call ``fn(*args)`` on the Tk thread: right away if we are on it, otherwise at the next drain """
+        if self.is_ui_thread():
+            fn(*args)
+        else:
+            self.post(fn, *args)
+
+    def drain(self):
+        """ Run the work posted so far, up to ``batch_size`` items """
+        batch = {}
+        for i in range(min(len(self.queue), self.batch_size)):
+            key, fn, args = self.queue.popleft()
+            if key is None:
+                key = i
+            else:
+                batch.pop(key, None)
+            batch[key] = fn, args
+        for fn, args in batch.values():
+            try:
+                fn(*args)
+            except Exception:
+                self.root.report_callback_exception(*sys.exc_info())
+
+    @staticmethod
+    def _notify(prop, this):
+        prop.notify_bindings(prop.fget(this), this)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        if self._pipe is not None:
+            self.root.tk.deletefilehandler(self._pipe[0])
+            for fd in self._pipe:
+                os.close(fd)
+            self._pipe = None
+        self._scheduled = True  # Nothing is drained any more
+        if Dispatcher.current is self:
+            Dispatcher.current = None
+
+    def _wake(self):
+        """ Schedule a drain, unless one is already scheduled """
+        with self._lock:
+            if self._scheduled:
+                return
+            self._scheduled = True
+        if self.is_ui_thread():
+            self._after_id = self.root.after(self.poll_interval, self._poll)
+            return
+        pipe = self._pipe
+        if pipe is None:  # Stopped
+            return
+        try:
+            os.write(pipe[1], b'x')
+        except OSError:
+            # The pipe is full, so the Tk thread is about to wake up anyway, or it has just been closed
+            pass
+
+    def _on_wake(self, fd, mask):
+        os.read(fd, 4096)
+        if self._after_id is None:
+            self._after_id = self.root.after(self.poll_interval, self._poll)
+
+    def _poll(self):
+        self._after_id = None
+        try:
+            self.drain()
+        finally:
+            if self._pipe is None:
+                # Tk cannot be woken up from other threads, so keep polling
+                self._after_id = self.root.after(self.poll_interval, self._poll)
+            else:
+                with self._lock:
+                    self._scheduled = bool(self.queue)
+                if self._scheduled:
+                    self._after_id = self.root.after(self.poll_interval, self._poll)
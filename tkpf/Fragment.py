@@ -0,0 +1,33 @@
+import sys
+import tkinter as tk
+
+from tkpf import Directive
+
+
+class Fragment(Directive.Structural):
+    """
+    Constructs a part of a template inside a frame of its own, with its own model and bindings.
+    Directives use it to create, recycle or drop parts of their template at run time.
+    In a template, ``<Fragment>`` just groups its children.
+    """
+
+    def __init__(self, parent_widget, parent_directive, model=None, template=None):
+        self.template = template
+        super().__init__(parent_widget, parent_directive, model)
+
+    def create(self, parent):
+        frame = tk.Frame(parent)
+        if self.template is not None:
+            self.construct(self.template, frame)
+        return frame
+
+    def command_lookup(self, name):
+        handler = super().command_lookup(name)
+        if getattr(handler, '__self__', None) is self.model:
+            # Look the handler up at call time, so it follows the model when the fragment is rebound
+            return lambda *args: getattr(self.model, name)(*args)
+        return handler
+
+
+if sys.version_info < (3, 6):
+    Directive.Registry.register(Fragment)
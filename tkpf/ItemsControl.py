@@ -0,0 +1,154 @@
+import sys
+from tkinter import ttk
+
+from tkpf import Directive
+from tkpf.Fragment import Fragment
+from tkpf.ObservableList import Action
+
+
+class ItemsControl(Directive.Structural):
+    """
+    Displays a collection bound to ``items``, using its child element as the template of each item,
+    with the item as its model::
+
+        <ItemsControl items="[people]" rows="20">
+            <Label text="[name]"/>
+        </ItemsControl>
+
+    Only ``rows`` item views are ever created. Scrolling rebinds them to other items,
+    so the number of widgets and bindings does not depend on the size of the collection.
+    """
+
+    def __init__(self, parent_widget, parent_directive, model=None):
+        self.items = ()
+        self.rows = 10
+        self.offset = 0
+        self.item_template = None
+        self.containers = []
+        self._shown = 0
+        self._wheel_tag = None  # The bind tag of the widgets of this control, which scroll it with the mouse wheel
+        self._wheel_commands = []
+        super().__init__(parent_widget, parent_directive, model)
+
+    def create(self, parent):
+        frame = ttk.Frame(parent)
+        self.scrollbar = ttk.Scrollbar(frame, orient='vertical', command=self.yview)
+        self.scrollbar.pack(side='right', fill='y')
+        self.viewport = ttk.Frame(frame)
+        self.viewport.pack(side='left', fill='both', expand=True)
+        self._wheel_tag = 'TkpfItems' + str(frame)
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self._wheel_commands.append(frame.bind_class(self._wheel_tag, sequence, self._on_wheel))
+        for widget in (frame, self.scrollbar, self.viewport):
+            self._add_wheel_tag(widget)
+        return frame
+
+    def construct(self, elem, parent):
+        # The child element is not constructed here, it is the template of the items
+        self.item_template = elem
+        return None
+
+    def on_constructed(self):
+        self.refresh()
+
+    def config(self, **kwargs):
+        if 'rows' in kwargs:
+            self.rows = int(kwargs.pop('rows'))
+        if 'items' in kwargs:
+            items = kwargs.pop('items')
+            # An emptied observable list is kept, its later changes refer to it
+            self.items = () if items is None else items
+        super().config(**kwargs)
+        self.offset = self._clamp(self.offset)
+        self.refresh()
+
+    def rebind(self, model):
+        # The item views are bound to the items, not to the model
+        self.model = model
+
+    @property
+    def named_widgets(self):
+        return self.parent_directive.named_widgets
+
+    def refresh(self):
+        """ Bind the item views to the items from ``offset``, creating, showing or hiding views as needed """
+        if self.item_template is None:
+            return
+        count = min(self.rows, len(self.items) - self.offset)
+        for i in range(count):
+            item = self.items[self.offset + i]
+            if i == len(self.containers):
+                self.containers.append(Fragment(self.viewport, self, model=item, template=self.item_template))
+                self.child_directives.append(self.containers[-1])
+                self._add_wheel_tag(self.containers[-1].root_widget)
+            elif self.containers[i].model is not item:
+                self.containers[i].rebind(item)
+            if i >= self._shown:
+                self.containers[i].root_widget.pack(fill='x')
+        for container in self.containers[count:self._shown]:
+            container.root_widget.pack_forget()
+        self._shown = count
+        self._update_scrollbar()
+
+    def apply_change(self, prop, change):
+        """ Rebind only the visible item views, and only if the change of a bound observable list affects them """
+        if prop != 'items':
+            return
+        offset = self._clamp(self.offset)
+        if change.action == Action.MOVE:
+            first = min(change.index, change.new_index)
+        else:
+            first = change.index
+        if offset != self.offset or first < offset + self.rows:
+            self.offset = offset
+            self.refresh()
+        else:
+            self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        if self.items:
+            self.scrollbar.set(self.offset / len(self.items), (self.offset + self._shown) / len(self.items))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll_to(self, offset):
+        offset = self._clamp(offset)
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+
+    def yview(self, *args):
+        """ The scrollbar command """
+        if args[0] == 'moveto':
+            self.scroll_to(int(float(args[1]) * len(self.items)))
+        elif args[0] == 'scroll':
+            step = self.rows if args[2] == 'pages' else 1
+            self.scroll_to(self.offset + int(args[1]) * step)
+
+    def _clamp(self, offset):
+        return max(0, min(offset, len(self.items) - self.rows))
+
+    def _on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self.offset - 1)
+        else:
+            self.scroll_to(self.offset + 1)
+
+    def _add_wheel_tag(self, widget):
+        # Last, so that widgets in the item views which scroll themselves can stop it with "break"
+        widget.bindtags(widget.bindtags() + (self._wheel_tag,))
+        for child in widget.winfo_children():
+            self._add_wheel_tag(child)
+
+    def dispose(self):
+        # Class bindings outlive the widgets
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.root_widget.unbind_class(self._wheel_tag, sequence)
+        for name in self._wheel_commands:
+            self.root_widget.deletecommand(name)
+        self._wheel_commands.clear()
+        super().dispose()
+
+
+if sys.version_info < (3, 6):
+    Directive.Registry.register(ItemsControl)
@@ -4,42 +4,230 @@ import tkinter as tk
 from warnings import warn
 
 from tkpf import Directive
+from tkpf.Fragment import Fragment
+from tkpf.ObservableList import Action
 
 
 class Menu(Directive.Structural):
-    """ Translates the XML hierarchy into proper method calls when constructing a menu """
+    """
+    Translates the XML hierarchy into proper method calls when constructing a menu.
+
+    A menu with ``items`` bound to a collection uses its child elements as the template of the entries
+    of each item, with the item as their model::
+
+        <Menu label="Recent files" items="[recent_files]">
+            <Command label="[name]" command="reopen"/>
+        </Menu>
+
+    The changes of an observable list only insert or delete the entries of the affected items.
+    The indices of the entries are kept track of here, the menu is never asked for them.
+    Cascades in the template are constructed when they are first posted.
+    """
+
+    def __init__(self, parent_widget, parent_directive, model=None):
+        self.tearoff = 0  # The number of tearoff entries
+        self.entries = 0  # The number of entries constructed, apart from the tearoff entry
+        self.items = ()
+        self.item_template = None  # The child elements, if the menu has items
+        self.deferred = None  # The child elements, until the menu is first posted
+        self.built = False
+        super().__init__(parent_widget, parent_directive, model)
 
     def create(self, parent):
+        if isinstance(parent, tk.Menu):
+            return tk.Menu(parent, tearoff=0)
         menu = tk.Menu(parent)
-        if not isinstance(parent, tk.Menu):
-            parent.winfo_toplevel().config(menu=menu)
+        self.tearoff = 1
+        parent.winfo_toplevel().config(menu=menu)
         return menu
 
+    def construct(self, elem, parent):
+        if parent is self.root_widget:
+            if self.item_template is not None:
+                self.item_template.append(elem)
+                return None
+            if self.deferred is not None:
+                self.deferred.append(elem)
+                return None
+        return super().construct(elem, parent)
+
+    def on_constructed(self):
+        if self.deferred is None:
+            self.built = True
+            self.refresh()
+
+    def defer(self):
+        """ Construct the children of this menu only when it is first posted """
+        self.deferred = []
+        self.root_widget.config(postcommand=self._on_post)
+
+    def _on_post(self):
+        if self.deferred is None:
+            return
+        elems, self.deferred = self.deferred, None
+        for elem in elems:
+            self.construct(elem, self.root_widget)
+        self.built = True
+        self.refresh()
+
+    def config(self, **kwargs):
+        if 'tearoff' in kwargs:
+            self.tearoff = 1 if self.root_widget.getboolean(kwargs['tearoff']) else 0
+        if 'items' in kwargs:
+            items = kwargs.pop('items')
+            # An emptied observable list is kept, its later changes refer to it
+            self.items = () if items is None else items
+            if self.item_template is None:
+                self.item_template = []
+            self.refresh()
+        super().config(**kwargs)
+
     def add_child(self, parent, classname, attrib, text=None):
         name = attrib.pop('name', None)
         if text:
             attrib['label'] = text
+        index, config_method = self.new_entry(parent)
+        pseudo_name = str(parent) + '.Tkpf_menuitem:' + str(index)
         if classname == 'Menu':
+            items = attrib.pop('items', None)
             directive, widget = super().inflate(parent, classname)
-            widget.config(tearoff=0)
-            self.root_widget.add_cascade(menu=widget, **self.resolve_bindings(widget, attrib))
+            options = self.resolve_bindings(None, attrib, widget_name=pseudo_name, widget_config_method=config_method)
+            options['menu'] = widget
+            self.insert_entry(parent, index, 'cascade', options)
+            if items is not None:
+                directive.config(**self.resolve_bindings(widget, {'items': items},
+                                                         widget_config_method=directive.config,
+                                                         widget_change_method=directive.apply_change))
             self.named_widgets[name] = directive or widget
             return directive, widget
         else:
-            last = 1 + (self.root_widget.index('end') or 0)
-            pseudo_name = str(self.root_widget) + '.Tkpf_menuitem:' + str(last)
-            config_method = functools.partial(self.root_widget.entryconfig, last)
-            self.root_widget.add(classname.lower(), **self.resolve_bindings(None, attrib,
-                                                                            widget_name=pseudo_name,
-                                                                            widget_config_method=config_method))
+            self.insert_entry(parent, index, classname.lower(),
+                              self.resolve_bindings(None, attrib,
+                                                    widget_name=pseudo_name,
+                                                    widget_config_method=config_method))
             if name:
                 warn('Menu items cannot be named')
-            return None, self.root_widget
+            return None, parent
+
+    def new_entry(self, menu) -> tuple:
+        """ The index of the next entry, and the method that configures it """
+        index = self.tearoff + self.entries
+        self.entries += 1
+        return index, functools.partial(menu.entryconfig, index)
+
+    @staticmethod
+    def insert_entry(menu, index, kind, options):
+        menu.insert(index, kind, **options)
+
+    def rebind(self, model):
+        if self.item_template is None:
+            super().rebind(model)
+        else:
+            # The entries are bound to the items, not to the model
+            self.model = model
+
+    def refresh(self):
+        """ Construct the entries of all the items again """
+        if self.item_template is None or not self.built:
+            return
+        self._remove(0, len(self.child_directives))
+        self._insert(0, self.items)
+
+    def apply_change(self, prop, change):
+        """ Insert or delete only the entries of the items affected by the change of a bound observable list """
+        if prop != 'items' or not self.built:
+            return
+        if change.action == Action.MOVE:
+            self._remove(change.index, 1)
+            self._insert(change.new_index, [self.items[change.new_index]])
+        elif change.action == Action.REPLACE and len(change.items) == len(change.old_items):
+            for i, item in enumerate(change.items, change.index):
+                if any(cascade.built for cascade in self.child_directives[i].child_directives):
+                    # The cascades of the old item have been constructed for it
+                    self._remove(i, 1)
+                    self._insert(i, [item])
+                else:
+                    self.child_directives[i].rebind(item)
+        else:
+            self._remove(change.index, len(change.old_items))
+            self._insert(change.index, change.items)
+
+    # In a menu with items, the directives inside are the entries of each item, in the order of the items
+
+    def _insert(self, position, items):
+        width = len(self.item_template)
+        self.child_directives[position:position] = [
+            _MenuItem(self, item, self.tearoff + (position + i) * width) for i, item in enumerate(items)]
+        self._renumber(position + len(items))
+
+    def _remove(self, position, count):
+        removed = self.child_directives[position:position + count]
+        if not removed:
+            return
+        del self.child_directives[position:position + count]
+        width = len(self.item_template)
+        if width:
+            # Menu.delete would ask the menu about every entry, to delete their commands
+            first = removed[0].index
+            self.root_widget.tk.call(str(self.root_widget), 'delete', first, first + len(removed) * width - 1)
+        for entries in removed:
+            entries.delete()
+        self._renumber(position)
+
+    def _renumber(self, position):
+        width = len(self.item_template)
+        for i in range(position, len(self.child_directives)):
+            self.child_directives[i].index = self.tearoff + i * width
 
     @property
     def named_widgets(self):
         return self.parent_directive.named_widgets
 
 
+class _MenuItem(Fragment, Menu):
+    """ The entries of one item of a menu with items, starting at ``index`` """
+
+    def __init__(self, menu: Menu, model, index: int):
+        self.index = index
+        self.commands = []  # The Tcl commands registered for the entries
+        super().__init__(menu.root_widget, menu, model, menu.item_template)
+        for elem in self.template:
+            self.construct(elem, self.parent_widget)
+
+    def create(self, parent):
+        return None
+
+    def add_child(self, parent, classname, attrib, text=None):
+        directive, widget = super().add_child(parent, classname, attrib, text)
+        if directive:
+            directive.defer()
+        return directive, widget
+
+    def new_entry(self, menu) -> tuple:
+        offset = self.entries
+        self.entries += 1
+        return self.index + offset, functools.partial(self.entryconfig, offset)
+
+    def entryconfig(self, offset, **kwargs):
+        # The entries move when the entries of other items are inserted or deleted before them
+        self.parent_widget.entryconfig(self.index + offset, **kwargs)
+
+    def insert_entry(self, menu, index, kind, options):
+        # The commands are registered here, so that they can be deleted without asking the menu for them
+        for key, value in options.items():
+            if callable(value):
+                options[key] = menu.register(value)
+                self.commands.append(options[key])
+        menu.insert(index, kind, **options)
+
+    def delete(self):
+        """ Forget the entries, after they have been deleted from the menu """
+        for directive in self.child_directives:
+            directive.root_widget.destroy()
+        for name in self.commands:
+            self.parent_widget.deletecommand(name)
+        self.dispose()
+
+
 if sys.version_info < (3, 6):
     Directive.Registry.register(Menu)
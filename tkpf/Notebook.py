@@ -1,28 +1,134 @@
 import sys
+import tkinter as tk
 from tkinter import ttk
 
 from tkpf import Directive
+from tkpf import template
+from tkpf.Fragment import Fragment
+
+
+class _Tab:
+    __slots__ = ('elem', 'widget', 'content', 'unload_id')
+
+    def __init__(self, elem, widget):
+        self.elem = elem
+        self.widget = widget
+        self.content = None  # The constructed children, if they are constructed
+        self.unload_id = None
+
+
+class _TabContent(Fragment):
+    """ The children of a lazily constructed tab, constructed into a frame filling the tab widget.
+    The frame is destroyed when they are unloaded, the tab widget is kept. """
+
+    def __init__(self, tab, notebook):
+        self.tab = tab
+        super().__init__(tab.widget, notebook, notebook.model)
+
+    def create(self, parent):
+        frame = ttk.Frame(parent) if isinstance(parent, ttk.Widget) else tk.Frame(parent)
+        for child in self.tab.elem.children:
+            self.construct(child, frame)
+        frame.pack(fill='both', expand=True)
+        return frame
 
 
 class Notebook(Directive.Structural):
+    """
+    With ``lazy="true"``, the children of each tab element are only constructed and bound
+    when the tab is first selected.
+    With ``unload="<milliseconds>"``, they are also destroyed and unbound after the tab has been hidden that long,
+    and constructed again when it is selected again. This implies ``lazy``.
+    """
+
+    def __init__(self, parent_widget, parent_directive, model=None):
+        self.lazy = False
+        self.unload_delay = None
+        self.tabs = {}  # Lazy tabs by widget path name
+        self._selected = None
+        super().__init__(parent_widget, parent_directive, model)
+
     def create(self, parent):
         if parent.tk.call('tk', 'windowingsystem') == 'aqua':
             s = ttk.Style()
             s.configure('TNotebook.Tab', padding=(12, 8, 12, 0))
-        return ttk.Notebook(parent)
+        notebook = ttk.Notebook(parent)
+        notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
+        return notebook
+
+    def config(self, **kwargs):
+        if 'lazy' in kwargs:
+            self.lazy = kwargs.pop('lazy') in (True, 'true', 'True', '1')
+        if 'unload' in kwargs:
+            self.unload_delay = int(kwargs.pop('unload'))
+            self.lazy = True
+        super().config(**kwargs)
+
+    def construct(self, elem, parent):
+        if not (self.lazy and parent is self.root_widget):
+            return super().construct(elem, parent)
+        # Only the tab widget itself is constructed now, its children when it is selected
+        if not isinstance(elem, template.Node):
+            elem = template.compile_tree(elem)
+        directive, widget = self.add_element(parent, elem)
+        self.tabs[str(widget)] = _Tab(elem, widget)
+        if directive:
+            directive.on_constructed()
+        return directive or widget
+
+    def on_constructed(self):
+        self._on_tab_changed(None)
 
-    def add_child(self, parent, classname, attrib, text=None):
-        tab_args = {k[4:]: v for k, v in attrib.items() if k.startswith('tab-')}
-        attrib = {k: v for k, v in attrib.items() if not k.startswith('tab-')}
-        directive, widget = super().add_child(parent, classname, attrib, text)
+    def add_element(self, parent, elem):
+        directive, widget = super().add_element(parent, elem)
         if parent is self.root_widget:
-            self.root_widget.add(widget, **tab_args)
+            self.root_widget.add(widget, **elem.extra.get('tab', {}))
         return directive, widget
 
     @property
     def named_widgets(self):
         return self.parent_directive.named_widgets
 
+    def load(self, tab: _Tab):
+        """ Construct the children of a lazy tab """
+        if tab.unload_id is not None:
+            self.root_widget.after_cancel(tab.unload_id)
+            tab.unload_id = None
+        if tab.content is None:
+            tab.content = _TabContent(tab, self)
+            self.child_directives.append(tab.content)
+            self.named_widgets.update(tab.content.named_widgets)
+
+    def unload(self, tab: _Tab):
+        """ Dispose and destroy the children of a lazy tab """
+        tab.unload_id = None
+        if tab.content is None:
+            return
+        self.child_directives.remove(tab.content)
+        for name in tab.content.named_widgets:
+            self.named_widgets.pop(name, None)
+        tab.content.dispose()
+        tab.content.root_widget.destroy()
+        tab.content = None
+
+    def dispose(self):
+        for tab in self.tabs.values():
+            if tab.unload_id is not None:
+                self.root_widget.after_cancel(tab.unload_id)
+                tab.unload_id = None
+        super().dispose()
+
+    def _on_tab_changed(self, _):
+        selected = str(self.root_widget.select())
+        if selected == self._selected:
+            return
+        previous = self.tabs.get(self._selected)
+        if previous and previous.content and self.unload_delay is not None:
+            previous.unload_id = self.root_widget.after(self.unload_delay, self.unload, previous)
+        self._selected = selected
+        if selected in self.tabs:
+            self.load(self.tabs[selected])
+
 
 if sys.version_info < (3, 6):
     Directive.Registry.register(Notebook)
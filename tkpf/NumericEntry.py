@@ -7,6 +7,9 @@ class Action(Enum):
     INSERT = 1
 
 
+_insert = str(Action.INSERT.value)  # As Tk passes it to the validate command
+
+
 class NumericEntry(ttk.Entry):
     def __init__(self, *args, datatype: type=int, **kwargs):
         self.datatype = datatype
@@ -15,11 +18,13 @@ class NumericEntry(ttk.Entry):
                     validatecommand=(self.register(self.on_validate), '%d', '%P'))
 
     def on_validate(self, action, text):
-        if int(action) == Action.INSERT.value:
-            try:
-                self.datatype(text)
-                return True
-            except ValueError:
-                return False
-        else:
+        # This runs on every keystroke, so the usual cases are decided without converting the text
+        if action != _insert:
+            return True
+        if text.isdecimal() and self.datatype in (int, float):
+            return True
+        try:
+            self.datatype(text)
             return True
+        except ValueError:
+            return False
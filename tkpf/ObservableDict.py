@@ -0,0 +1,60 @@
+from collections.abc import MutableMapping
+
+from tkpf.ObservableList import Action, CollectionChange, Observable
+
+
+class ObservableDict(Observable, MutableMapping):
+    """ A dictionary that notifies its observers of every change with its key. """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._items = dict(*args, **kwargs)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, key):
+        return self._items[key]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __eq__(self, other):
+        if isinstance(other, ObservableDict):
+            other = other._items
+        return self._items == other
+
+    def __repr__(self):
+        return 'ObservableDict({!r})'.format(self._items)
+
+    def __setitem__(self, key, value):
+        if key in self._items:
+            old = self._items[key]
+            self._items[key] = value
+            self.notify(CollectionChange(Action.REPLACE, key, [value], [old]))
+        else:
+            self._items[key] = value
+            self.notify(CollectionChange(Action.INSERT, key, [value]))
+
+    def __delitem__(self, key):
+        old = self._items.pop(key)
+        self.notify(CollectionChange(Action.REMOVE, key, old_items=[old]))
+
+    def update(self, *args, **kwargs):
+        """ Set several keys, with a single notification """
+        values = dict(*args, **kwargs)
+        if values:
+            old = {k: self._items[k] for k in values if k in self._items}
+            self._items.update(values)
+            self.notify(CollectionChange(Action.REPLACE, None, values, old))
+
+    def reset(self, *args, **kwargs):
+        """ Replace all items, with a single notification """
+        self._items = dict(*args, **kwargs)
+        self.notify(CollectionChange(Action.RESET))
+
+    def clear(self):
+        self.reset()
@@ -0,0 +1,177 @@
+from collections.abc import MutableSequence
+from enum import Enum
+
+from tkpf.Dispatcher import Dispatcher
+
+
+class Action(Enum):
+    INSERT = 0
+    REMOVE = 1
+    MOVE = 2
+    REPLACE = 3
+    RESET = 4
+
+
+class CollectionChange:
+    """
+    Describes one change of an observable collection.
+
+    * ``INSERT``: ``items`` were inserted at ``index``
+    * ``REMOVE``: ``old_items`` were removed from ``index``
+    * ``MOVE``: the item at ``index`` was moved to ``new_index``
+    * ``REPLACE``: ``old_items`` from ``index`` were replaced by ``items``, not necessarily as many
+    * ``RESET``: anything else, consumers should reread the whole collection
+
+    For dictionaries, ``index`` is the key, or ``None`` for a batch update,
+    in which case ``items`` and ``old_items`` are dictionaries.
+    """
+    __slots__ = ('action', 'index', 'items', 'old_items', 'new_index')
+
+    def __init__(self, action: Action, index=None, items=(), old_items=(), new_index=None):
+        self.action = action
+        self.index = index
+        self.items = items
+        self.old_items = old_items
+        self.new_index = new_index
+
+    def __repr__(self):
+        return 'CollectionChange({}, index={!r}, items={!r}, old_items={!r}, new_index={!r})'.format(
+            self.action.name, self.index, self.items, self.old_items, self.new_index)
+
+
+class Observable:
+    """ Base of the observable collections. Observers get called with a :class:`CollectionChange`.
+
+    Observers are called on the Tk thread. The changes made on other threads reach them as a single reset,
+    because by the time the Tk thread gets to them, the collection may have changed again,
+    and the positions in the changes would no longer match it. """
+
+    def __init__(self):
+        self.observers = []
+
+    def notify(self, change: CollectionChange):
+        dispatcher = Dispatcher.current
+        if dispatcher is not None and not dispatcher.is_ui_thread():
+            dispatcher.post_keyed((Observable, id(self)), self.notify, CollectionChange(Action.RESET))
+            return
+        for observer in self.observers:
+            observer(change)
+
+
+class ObservableList(Observable, MutableSequence):
+    """ A list that notifies its observers of every change with its position. """
+
+    def __init__(self, iterable=()):
+        super().__init__()
+        self._items = list(iterable)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def __eq__(self, other):
+        if isinstance(other, ObservableList):
+            other = other._items
+        return self._items == other
+
+    def __repr__(self):
+        return 'ObservableList({!r})'.format(self._items)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self._items))
+            if step != 1:
+                self._items[index] = value
+                self.notify(CollectionChange(Action.RESET))
+                return
+            self.replace_range(start, max(start, stop), value)
+        else:
+            index = self._normalize(index)
+            old = self._items[index]
+            self._items[index] = value
+            self.notify(CollectionChange(Action.REPLACE, index, [value], [old]))
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self._items))
+            if step != 1:
+                del self._items[index]
+                self.notify(CollectionChange(Action.RESET))
+                return
+            old = self._items[start:stop]
+            del self._items[start:stop]
+            if old:
+                self.notify(CollectionChange(Action.REMOVE, start, old_items=old))
+        else:
+            index = self._normalize(index)
+            old = self._items.pop(index)
+            self.notify(CollectionChange(Action.REMOVE, index, old_items=[old]))
+
+    def insert(self, index, value):
+        index = min(self._normalize(index, clamp=True), len(self._items))
+        self._items.insert(index, value)
+        self.notify(CollectionChange(Action.INSERT, index, [value]))
+
+    def extend(self, values):
+        """ Append all values, with a single notification """
+        values = list(values)
+        if values:
+            index = len(self._items)
+            self._items.extend(values)
+            self.notify(CollectionChange(Action.INSERT, index, values))
+
+    def __iadd__(self, values):
+        self.extend(values)
+        return self
+
+    def replace_range(self, start, stop, values):
+        """ Replace the items from ``start`` to ``stop`` with ``values``, with a single notification """
+        values = list(values)
+        old = self._items[start:stop]
+        self._items[start:stop] = values
+        if not old:
+            self.notify(CollectionChange(Action.INSERT, start, values))
+        elif not values:
+            self.notify(CollectionChange(Action.REMOVE, start, old_items=old))
+        else:
+            self.notify(CollectionChange(Action.REPLACE, start, values, old))
+
+    def move(self, index, new_index):
+        """ Move the item at ``index`` so that it ends up at ``new_index`` """
+        index, new_index = self._normalize(index), self._normalize(new_index)
+        if index != new_index:
+            self._items.insert(new_index, self._items.pop(index))
+            self.notify(CollectionChange(Action.MOVE, index, new_index=new_index))
+
+    def reset(self, values=()):
+        """ Replace all items, with a single notification """
+        self._items = list(values)
+        self.notify(CollectionChange(Action.RESET))
+
+    def clear(self):
+        self.reset()
+
+    def sort(self, *args, **kwargs):
+        self._items.sort(*args, **kwargs)
+        self.notify(CollectionChange(Action.RESET))
+
+    def reverse(self):
+        self._items.reverse()
+        self.notify(CollectionChange(Action.RESET))
+
+    def _normalize(self, index, clamp=False):
+        if index < 0:
+            index += len(self._items)
+            if clamp:
+                index = max(0, index)
+        if not clamp and not 0 <= index < len(self._items):
+            raise IndexError('ObservableList index out of range')
+        return index
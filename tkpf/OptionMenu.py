@@ -1,5 +1,9 @@
+import tkinter as tk
+from collections.abc import Mapping
 from tkinter import ttk
 
+from tkpf.ObservableList import Action
+
 
 class OptionMenu(ttk.OptionMenu):
     """ The role of this OptionMenu subclass is just to standardize the API so that it can be used
@@ -7,12 +11,45 @@ class OptionMenu(ttk.OptionMenu):
 
     def __init__(self, parent, **kwargs):
         kw = {k: v for k, v in kwargs.items() if k not in {'name', 'model'}}
+        self._values = ()  # The bound collection of values
         super().__init__(parent, None, **kw)
 
-    def config(self, values=list(), variable=None, **kwargs):
+    def config(self, values=None, variable=None, **kwargs):
         if variable:
             self._variable = variable
             kwargs['textvariable'] = variable
-        if values:
-            self.set_menu(values[0], *values)
+        if values is not None:
+            self._values = values
+            values = list(values)
+            if values:
+                self.set_menu(values[0], *values)
+            else:
+                # Emptied, e.g. by clear(): nothing can be selected any more
+                self.set_menu(None)
+                if self._variable is not None:
+                    self._variable.set('')
         super().config(**kwargs)
+
+    def apply_change(self, prop, change):
+        """ Update only the affected menu entries when a bound observable list of values changes """
+        if prop != 'values':
+            return
+        if isinstance(self._values, Mapping):
+            # The changes of a dictionary are identified by key, not position: show its keys again
+            self.set_menu(None, *self._values)
+            return
+        menu = self['menu']
+        if change.action == Action.MOVE:
+            label = menu.entrycget(change.index, 'label')
+            menu.delete(change.index)
+            self._insert_entry(menu, change.new_index, label)
+            return
+        if change.old_items:
+            menu.delete(change.index, change.index + len(change.old_items) - 1)
+        for i, val in enumerate(change.items):
+            self._insert_entry(menu, change.index + i, val)
+
+    def _insert_entry(self, menu, index, val):
+        # Like the entries of set_menu(), selecting it sets the variable and calls the command
+        menu.insert_radiobutton(index, label=val, variable=self._variable,
+                                command=tk._setit(self._variable, val, self._callback))
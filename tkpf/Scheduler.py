@@ -0,0 +1,76 @@
+import time
+import weakref
+
+
+class Scheduler:
+    """ Coalesces the view updates of deferred bindings and applies them once per Tk idle cycle.
+    Only the last value written to a binding before a flush gets applied.
+    Bindings with a maximum update rate are flushed no more often than that. """
+
+    @classmethod
+    def of(cls, root) -> 'Scheduler':
+        """ Return the scheduler belonging to the given Tk root, creating it if needed """
+        if root is None:
+            raise RuntimeError('Deferred bindings without a target widget need tkinter\'s default root')
+        try:
+            return root._tkpf_scheduler
+        except AttributeError:
+            root._tkpf_scheduler = cls(root)
+            return root._tkpf_scheduler
+
+    def __init__(self, root):
+        self.root = root
+        self.dirty = {}
+        self.next_flush = weakref.WeakKeyDictionary()
+        self._idle_id = None
+        self._timer_id = None
+        self._timer_due = None
+
+    def schedule(self, binding, val):
+        """ Mark the binding dirty, to be updated to ``val`` at the next flush """
+        self.dirty[binding] = val
+        due = self.next_flush.get(binding)
+        if due is None or due <= time.monotonic():
+            if self._idle_id is None:
+                self._idle_id = self.root.after_idle(self._on_idle)
+        else:
+            self._schedule_timer(due)
+
+    def discard(self, binding):
+        """ Forget a binding that is not going to be updated any more """
+        self.dirty.pop(binding, None)
+        self.next_flush.pop(binding, None)
+
+    def flush(self):
+        """ Apply the pending view updates whose bindings are not rate limited at the moment """
+        if self._idle_id is not None:
+            self.root.after_cancel(self._idle_id)
+            self._idle_id = None
+        now = time.monotonic()
+        dirty, self.dirty = self.dirty, {}
+        for binding, val in dirty.items():
+            due = self.next_flush.get(binding)
+            if due is not None and due > now:
+                self.dirty[binding] = val
+                self._schedule_timer(due)
+                continue
+            if binding.max_rate:
+                self.next_flush[binding] = now + 1 / binding.max_rate
+            binding.update_view(val)
+
+    def _on_idle(self):
+        self._idle_id = None
+        self.flush()
+
+    def _schedule_timer(self, due):
+        if self._timer_id is not None:
+            if self._timer_due <= due:
+                return
+            self.root.after_cancel(self._timer_id)
+        self._timer_due = due
+        self._timer_id = self.root.after(max(1, int((due - time.monotonic()) * 1000) + 1), self._on_timer)
+
+    def _on_timer(self):
+        self._timer_id = None
+        self._timer_due = None
+        self.flush()
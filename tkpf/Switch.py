@@ -0,0 +1,130 @@
+import sys
+import tkinter as tk
+
+from tkpf import Directive
+from tkpf import template
+from tkpf.Fragment import Fragment
+
+
+class _Branch(Fragment):
+    """ The elements of one case, constructed into a frame of their own """
+
+    def __init__(self, elems, switch):
+        self.elems = elems
+        super().__init__(switch.root_widget, switch, switch.model)
+
+    def create(self, parent):
+        frame = tk.Frame(parent)
+        for elem in self.elems:
+            self.construct(elem, frame)
+        return frame
+
+
+class Switch(Directive.Structural):
+    """
+    Shows the child elements whose ``switch-case`` attribute matches ``value``,
+    or the ones without it if none of them match::
+
+        <Switch value="[mode]">
+            <Frame switch-case="simple">...</Frame>
+            <Frame switch-case="advanced">...</Frame>
+            <Label>Unknown mode</Label>
+        </Switch>
+
+    The elements of a case are only constructed when it is first shown. When it gets hidden, they are kept,
+    and their bindings are suspended: they don't update the hidden widgets, and those that changed meanwhile
+    are refreshed once when the case is shown again. So switching to a case shown before takes two Tk calls.
+    """
+
+    def __init__(self, parent_widget, parent_directive, model=None):
+        self.value = None
+        self.cases = {}  # Compiled child elements by case
+        self.branches = {}  # The constructed cases
+        self.current = None  # The branch shown
+        self._constructed = False
+        super().__init__(parent_widget, parent_directive, model)
+
+    def create(self, parent):
+        return tk.Frame(parent)
+
+    def case_of(self, elem):
+        """ The case a child element belongs to, None for the default one """
+        return elem.extra.get('switch', {}).get('case')
+
+    def select(self, value):
+        """ The case to show for a value """
+        case = str(value)
+        return case if case in self.cases else None
+
+    def construct(self, elem, parent):
+        # The children are constructed when their case is first shown
+        if not isinstance(elem, template.Node):
+            elem = template.compile_tree(elem)
+        self.cases.setdefault(self.case_of(elem), []).append(elem)
+        return None
+
+    def on_constructed(self):
+        self._constructed = True
+        self.show(self.select(self.value))
+
+    def config(self, **kwargs):
+        if 'value' in kwargs:
+            self.value = kwargs.pop('value')
+            if self._constructed:
+                self.show(self.select(self.value))
+        super().config(**kwargs)
+
+    @property
+    def named_widgets(self):
+        return self.parent_directive.named_widgets
+
+    def show(self, case):
+        """ Show the elements of a case, constructing them if needed, and hide the others """
+        branch = self.branches.get(case)
+        if branch is self.current and (branch is not None or case not in self.cases):
+            return
+        if self.current is not None:
+            self.current.root_widget.pack_forget()
+            self.current.suspend()
+        if branch is None and case in self.cases:
+            branch = self.branches[case] = _Branch(self.cases[case], self)
+            self.child_directives.append(branch)
+            self.named_widgets.update(branch.named_widgets)
+        elif branch is not None:
+            branch.resume()
+        if branch is not None:
+            branch.root_widget.pack(fill='both', expand=True)
+        else:
+            # Without anything packed in it, the frame would keep its size
+            self.root_widget.config(width=1, height=1)
+        self.current = branch
+
+
+class If(Switch):
+    """
+    Shows its child elements if ``condition`` is true, except those with ``if-else="true"``,
+    which are shown if it is false::
+
+        <If condition="[logged_in]">
+            <Frame>...</Frame>
+            <Label if-else="true">Please log in</Label>
+        </If>
+
+    The hidden elements are kept, and their bindings suspended, see :class:`Switch`.
+    """
+
+    def case_of(self, elem):
+        return elem.extra.get('if', {}).get('else') not in ('true', 'True', '1')
+
+    def select(self, value):
+        return bool(value)
+
+    def config(self, **kwargs):
+        if 'condition' in kwargs:
+            kwargs['value'] = kwargs.pop('condition')
+        super().config(**kwargs)
+
+
+if sys.version_info < (3, 6):
+    Directive.Registry.register(Switch)
+    Directive.Registry.register(If)
@@ -0,0 +1,141 @@
+import re
+import tkinter as tk
+from contextlib import contextmanager
+from tkinter import ttk
+
+_special = re.compile(r'[\s{}\[\]$;"\\#]')
+_escapes = {'\n': '\\n', '\r': '\\r', '\t': '\\t'}
+
+# Widget classes of tkinter whose constructors use the results of Tcl commands
+_unrecordable = {tk.Tk, tk.Toplevel, tk.OptionMenu, ttk.OptionMenu, ttk.LabeledScale}
+_recorded_methods = ('__init__', 'configure', 'config', 'pack_configure', 'pack', 'grid_configure', 'grid',
+                     'place_configure', 'place', 'grid_columnconfigure', 'columnconfigure')
+
+_weight_grid_columns = """
+proc ::tkpf::weight_grid_columns {w} {
+    if {[llength [grid slaves $w]]} {
+        for {set i 0} {$i < [lindex [grid size $w] 0]} {incr i} {
+            grid columnconfigure $w $i -weight 1
+        }
+    }
+}"""
+
+
+def quote(value) -> str:
+    """ Turn a Python value into one word of a Tcl script, converting it the way tkinter does """
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, (tuple, list)):
+        value = ' '.join(quote(item) for item in value)
+    else:
+        value = str(value)
+    if not value:
+        return '{}'
+    return _special.sub(lambda match: _escapes.get(match.group(), '\\' + match.group()), value)
+
+
+class _Recorder:
+    """ Stands in for the Tcl interpreter of a widget, and collects the commands sent to it into a script """
+
+    def __init__(self, interpreter, commands):
+        self.interpreter = interpreter
+        self.commands = commands
+
+    def call(self, *args):
+        if len(args) == 1 and isinstance(args[0], tuple):
+            args = args[0]
+        self.commands.append(' '.join(quote(arg) for arg in args))
+        return ''
+
+    def __getattr__(self, item):
+        # Registering callbacks and converting values does not need to be deferred
+        return getattr(self.interpreter, item)
+
+
+class TclBatch:
+    """
+    Collects the Tcl commands that create, configure and lay out plain widgets while a view is being constructed,
+    and evaluates them together in a single script, instead of making a round trip to Tcl for each.
+
+    While a widget is being recorded, its Tcl interpreter is replaced by a recorder, so the commands tkinter sends
+    for it are collected instead of evaluated. This only works for commands whose result is not needed,
+    so only the widget classes of tkinter that don't override the recorded methods take part.
+    Directives flush the batch before and after they are constructed, so they always see real widgets.
+    """
+    enabled = True  # Set to False to evaluate every command right away, e.g. to see which element an error comes from
+    depth = 0  # Nesting level of the constructions in progress, batching only happens inside them
+    interpreter = None  # The interpreter the collected commands are for
+    commands = []
+    _recordable = {}
+
+    @classmethod
+    def can_record(cls, widget_class) -> bool:
+        """ Whether the Tcl commands creating, configuring and laying out widgets of this class can be batched """
+        if not cls.enabled:
+            return False
+        try:
+            return cls._recordable[widget_class]
+        except KeyError:
+            ret = cls._recordable[widget_class] = isinstance(widget_class, type) \
+                and issubclass(widget_class, tk.BaseWidget) and widget_class not in _unrecordable \
+                and all(getattr(getattr(widget_class, name, None), '__module__', None) in ('tkinter', 'tkinter.ttk')
+                        for name in _recorded_methods)
+            return ret
+
+    @classmethod
+    @contextmanager
+    def recording(cls, widget):
+        """ Collect the Tcl commands sent for the widget in the ``with`` block, instead of evaluating them.
+        Widgets of classes that cannot be recorded are left alone. """
+        if not cls.can_record(type(widget)):
+            yield widget
+            return
+        interpreter = widget.tk
+        if cls.interpreter is not interpreter:
+            cls.flush()
+            cls.interpreter = interpreter
+        widget.tk = _Recorder(interpreter, cls.commands)
+        try:
+            yield widget
+        finally:
+            widget.tk = interpreter
+
+    @classmethod
+    def create(cls, widget_class, parent, **kwargs):
+        """ Create a widget, collecting the Tcl commands that create it if its class can be recorded """
+        if not cls.can_record(widget_class):
+            return widget_class(parent, **kwargs)
+        with cls.recording(parent):
+            widget = widget_class(parent, **kwargs)
+        widget.tk = parent.tk
+        return widget
+
+    @classmethod
+    def weight_grid_columns(cls, widget):
+        """ Collect the Tcl commands making the grid columns of the widget share its extra width evenly """
+        if cls.interpreter is not widget.tk:
+            cls.flush()
+            cls.interpreter = widget.tk
+        root = widget._root()
+        if not getattr(root, '_tkpf_batch_procedures', False):
+            widget.tk.eval('namespace eval ::tkpf {}\n' + _weight_grid_columns)
+            root._tkpf_batch_procedures = True
+        cls.commands.append('::tkpf::weight_grid_columns ' + quote(widget))
+
+    @classmethod
+    def flush(cls):
+        """ Evaluate the collected commands """
+        if not cls.commands:
+            return
+        script = '\n'.join(cls.commands)
+        cls.commands.clear()
+        try:
+            cls.interpreter.eval(script)
+        except tk.TclError as e:
+            # The error info tells which command of the script failed
+            raise tk.TclError(cls.interpreter.globalgetvar('errorInfo')) from e
+
+    @classmethod
+    def discard(cls):
+        """ Forget the collected commands, after the construction they belong to failed """
+        cls.commands.clear()
@@ -1,23 +1,143 @@
+from contextlib import contextmanager
+
 from tkpf.AutoProperty import AutoProperty
-from tkpf.Bindable import Bindable
+from tkpf.Bindable import Bindable, batches
+from tkpf.Dispatcher import Dispatcher
+
+
+def _auto_property(member):
+    """ The AutoProperty that is the member itself or that it wraps, if any """
+    if isinstance(member, AutoProperty):
+        return member
+    if isinstance(member, Bindable) and isinstance(member.wrapped_property, AutoProperty):
+        return member.wrapped_property
+    return None
+
+
+def _default_setter(member):
+    """ The function setting the default value of an auto property when a viewmodel is created.
+    That is the setter of the AutoProperty, since there are no bindings to notify yet,
+    unless the member has a custom setter, which must run as it would for any other value. """
+    if isinstance(member, Bindable) and member.custom_setter is not None:
+        return member.fset
+    return _auto_property(member).fset
 
 
 class ViewModelMeta(type):
-    def __new__(mcs, name, bases, namespace):
-        for name, member in namespace.items():
-            if isinstance(member, AutoProperty):
-                member.name = name
-            elif isinstance(member, Bindable) and isinstance(member.wrapped_property, AutoProperty):
-                member.wrapped_property.name = name
-        return super().__new__(mcs, name, bases, namespace)
+    """
+    Names the auto properties of viewmodel classes, and precomputes how to initialize them.
+
+    With ``slots=True`` in the class statement, the auto properties of the class keep their values in slots
+    instead of the instance dictionary, and are accessed with the slot descriptors directly.
+    If all base viewmodels also have slots, instances have no dictionary at all::
+
+        class Row(ViewModel, slots=True):
+            name = Bindable(AutoProperty())
+    """
+
+    def __new__(mcs, name, bases, namespace, slots=False):
+        properties = []
+        for attr, member in namespace.items():
+            auto_property = _auto_property(member)
+            if auto_property is not None:
+                auto_property.name = attr
+                properties.append(attr)
+
+        if slots:
+            namespace = dict(namespace)
+            extra_slots = ['_tkpf_slot_' + attr for attr in properties]
+            if not any(base.__dictoffset__ for base in bases):
+                # Without an instance dictionary, the bookkeeping of bindings needs slots too
+                extra_slots += [slot for slot in ('_tkpf_subscriptions', '_tkpf_computed')
+                                if not any(hasattr(base, slot) for base in bases)]
+                if not any(base.__weakrefoffset__ for base in bases):
+                    extra_slots.append('__weakref__')
+            namespace['__slots__'] = tuple(namespace.get('__slots__', ())) + tuple(extra_slots)
+        cls = super().__new__(mcs, name, bases, namespace)
+
+        if slots:
+            for attr in properties:
+                setattr(cls, attr, namespace[attr].with_slot('_tkpf_slot_' + attr))
+
+        # The setters of all auto properties, including inherited ones, with their default values and types
+        attrs = {}
+        for klass in reversed(cls.__mro__):
+            for attr, member in vars(klass).items():
+                if _auto_property(member) is not None:
+                    attrs[attr] = None
+        cls._tkpf_defaults = tuple((_default_setter(member), _auto_property(member).default_value,
+                                    _auto_property(member).dtype)
+                                   for member in (getattr(cls, attr) for attr in attrs))
+        cls._tkpf_slots = tuple(slot for klass in cls.__mro__ for slot in vars(klass).get('__slots__', ())
+                                if slot.startswith('_tkpf_slot_'))
+        return cls
+
+    def __init__(cls, name, bases, namespace, slots=False):
+        super().__init__(name, bases, namespace)
 
 
 class ViewModel(metaclass=ViewModelMeta):
+    __slots__ = ()
+
+    deferred_updates = False  # Coalesce view updates of bindings and apply them once per Tk idle cycle
+    max_update_rate = None  # Maximum number of view updates per second per binding, implies deferred_updates
+
     def __init__(self):
         super().__init__()
+        if not type(self).__dictoffset__:
+            # Reading an empty slot raises an AttributeError, which is slow even if it gets caught
+            self._tkpf_subscriptions = None
+
+        for fset, default_value, dtype in type(self)._tkpf_defaults:
+            fset(self, default_value or dtype())
+
+    @contextmanager
+    def batch(self):
+        """
+        Defer the notifications of the bindable properties set in the ``with`` block until its end,
+        then notify each changed property once, with its final value::
+
+            with model.batch():
+                model.name = record.name
+                model.price = record.price
+
+        Nested batches of the same viewmodel notify at the end of the outermost one.
+        """
+        if id(self) in batches:
+            yield self
+            return
+        changed = batches[id(self)] = {}
+        try:
+            yield self
+        finally:
+            while changed:
+                # Computed properties invalidated by the notifications are collected and refreshed once, after them
+                pending = batches[id(self)] = {}
+                for prop in changed.values():
+                    prop.notify_changed(self)
+                changed = pending
+            del batches[id(self)]
+
+    def update(self, **values):
+        """ Set several properties in a :meth:`batch` """
+        with self.batch():
+            for name, val in values.items():
+                setattr(self, name, val)
+
+    def __getstate__(self):
+        """ Bindings and computed values are left out of the pickled state,
+        so that viewmodels can be sent to other processes """
+        state = getattr(self, '__dict__', {}).copy()
+        state.pop('_tkpf_subscriptions', None)
+        state.pop('_tkpf_computed', None)
+        slots = {slot: getattr(self, slot) for slot in type(self)._tkpf_slots if hasattr(self, slot)}
+        return (state or None, slots) if slots else state
 
-        for name, member in type(self).__dict__.items():
-            if isinstance(member, AutoProperty):
-                member.fset(self, member.default_value or member.dtype())
-            elif isinstance(member, Bindable) and isinstance(member.wrapped_property, AutoProperty):
-                member.fset(self, member.wrapped_property.default_value or member.dtype())
+    @staticmethod
+    def invoke_on_ui(fn, *args):
+        """ Call ``fn(*args)`` on the Tk thread. Use this to touch widgets from a worker thread.
+        Setting bindable properties from worker threads is safe without it. """
+        if Dispatcher.current:
+            Dispatcher.current.invoke(fn, *args)
+        else:
+            fn(*args)
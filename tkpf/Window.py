@@ -1,10 +1,22 @@
 import tkinter as tk
 from tkinter import ttk
 from tkpf import Component
+from tkpf.AsyncLoop import AsyncLoop
+from tkpf.Dispatcher import Dispatcher
 
 _windows = []
 
 
+def _on_destroy(event):
+    # The event is also delivered for every widget inside the window
+    window = event.widget
+    if window not in _windows:
+        return
+    _windows.remove(window)
+    if Dispatcher.current and Dispatcher.current.root is window:
+        Dispatcher.current.stop()
+
+
 class Window(Component):
     @classmethod
     def new_window(cls):
@@ -12,11 +24,13 @@ class Window(Component):
             window = tk.Toplevel()
         else:
             window = tk.Tk()
+            Dispatcher.install(window)
             window.style = ttk.Style()
             if window.style.theme_use() == 'default' and 'clam' in window.style.theme_names():
                 window.style.theme_use('clam')
 
         _windows.append(window)
+        window.bind('<Destroy>', _on_destroy, add='+')
         return window
 
     def __init__(self, model):
@@ -25,4 +39,7 @@ class Window(Component):
 
     def show(self):
         self.parent_widget.wm_title(self.title)
-        self.root_widget.mainloop()
+        try:
+            self.root_widget.mainloop()
+        finally:
+            AsyncLoop.shutdown()
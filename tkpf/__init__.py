@@ -1,9 +1,54 @@
-from tkpf.Component import Component
-from tkpf.Window import Window
-from tkpf.AutoProperty import AutoProperty
-from tkpf.Bindable import Bindable
-from tkpf.Binding import Binding
-from tkpf.ViewModel import ViewModel
-from tkpf.NumericEntry import NumericEntry
-from tkpf.Menu import Menu
-from tkpf.Notebook import Notebook
+import importlib
+import sys
+import types
+
+# The public classes, by the module they are defined in. They are imported on first use,
+# so that importing tkpf does not import everything it could need, e.g. asyncio or multiprocessing.
+_exports = {
+    'Component': 'tkpf.Component',
+    'Window': 'tkpf.Window',
+    'AutoProperty': 'tkpf.AutoProperty',
+    'Bindable': 'tkpf.Bindable',
+    'Computed': 'tkpf.Computed',
+    'Binding': 'tkpf.Binding',
+    'ViewModel': 'tkpf.ViewModel',
+    'NumericEntry': 'tkpf.NumericEntry',
+    'Menu': 'tkpf.Menu',
+    'Notebook': 'tkpf.Notebook',
+    'BackgroundCommand': 'tkpf.BackgroundCommand',
+    'BackgroundStatus': 'tkpf.BackgroundCommand',
+    'Fragment': 'tkpf.Fragment',
+    'ItemsControl': 'tkpf.ItemsControl',
+    'ObservableList': 'tkpf.ObservableList',
+    'ObservableDict': 'tkpf.ObservableDict',
+    'DataGrid': 'tkpf.DataGrid',
+    'Switch': 'tkpf.Switch',
+    'If': 'tkpf.Switch',
+}
+__all__ = list(_exports)  # Star imports get them through _Package.__getattr__, so they stay lazy
+
+
+class _Package(types.ModuleType):
+    """ Imports the public classes of the package when they are first accessed.
+    Works like a module level ``__getattr__``, which older Pythons don't support. """
+
+    def __getattr__(self, name):
+        try:
+            module = _exports[name]
+        except KeyError:
+            raise AttributeError('module {!r} has no attribute {!r}'.format(self.__name__, name)) from None
+        ret = getattr(importlib.import_module(module), name)
+        super().__setattr__(name, ret)
+        return ret
+
+    def __setattr__(self, name, value):
+        # Importing a submodule binds it to the package, but its name should keep referring to the class in it
+        if isinstance(value, types.ModuleType) and _exports.get(name) == value.__name__:
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(_exports))
+
+
+sys.modules[__name__].__class__ = _Package
@@ -0,0 +1,185 @@
+"""
+Ahead-of-time compilation of templates to Python modules.
+
+The generated module has a ``build(view, parent)`` function that constructs the view hierarchy
+with straight-line code, so none of the attributes are interpreted at runtime.
+Elements of directives and of widget classes unknown at compile time are left to the interpreter.
+Components use a generated module instead of their template if it is named in ``template_module``.
+
+Generate ``ExampleWindow_xml.py`` next to the template::
+
+    python -m tkpf.codegen example/ExampleWindow.xml
+
+Or have the module generated at import time, without writing any file::
+
+    import tkpf.codegen
+    tkpf.codegen.install_import_hook()
+    import example.ExampleWindow_xml
+"""
+import argparse
+import importlib.abc
+import importlib.util
+import os
+import sys
+import tkinter as tk
+import xml.etree.ElementTree as Xml
+
+from tkpf import parser, template
+from tkpf.Binding import Binding
+from tkpf.Directive import Registry
+
+_suffixes = {'_xml': '.xml', '_yaml': '.yaml'}
+
+
+class _Generator:
+    def __init__(self, source_name):
+        self.source_name = source_name
+        self.nodes = []  # Source of the subtrees left to the interpreter
+        self.classes = []  # Names of the widget classes used
+        self.lines = []
+        self.counter = 0
+
+    def generate(self, node) -> str:
+        root = self.element(node, 'parent')
+        header = [
+            '# Generated by tkpf.codegen from {}. Do not edit.'.format(self.source_name),
+            'from tkpf import parser, template',
+            'from tkpf.Component import Component',
+            'from tkpf.Directive import Registry',
+            'from tkpf.TclBatch import TclBatch',
+            '',
+        ]
+        for i, source in enumerate(self.nodes):
+            header.append('_node{} = template.compile_tree({})'.format(i, source))
+        header += ['', '', 'def build(view, parent):', '    widgets = Registry.widgets',
+                   '    create, recording = TclBatch.create, TclBatch.recording']
+        header += ['    {0} = widgets[{0!r}]'.format(name) for name in self.classes]
+        header.append('    try:')
+        # Like Structural.construct, drop the collected commands of a failed construction
+        footer = ['        TclBatch.flush()', '    except BaseException:', '        TclBatch.discard()', '        raise',
+                  '    return ' + root, '']
+        return '\n'.join(header + self.lines + footer)
+
+    def emit(self, line):
+        self.lines.append('        ' + line)
+
+    def element(self, node, parent) -> str:
+        """ Emit the construction of one element and its children, and return the variable holding the result """
+        var = 'w{}'.format(self.counter)
+        self.counter += 1
+        cls = Registry.widgets.get(node.name)
+        if node.name in Registry.directives or not (isinstance(cls, type) and issubclass(cls, tk.BaseWidget)):
+            self.nodes.append(_source(node))
+            self.emit('{} = view.construct(_node{}, {})'.format(var, len(self.nodes) - 1, parent))
+            return var
+
+        if node.name not in self.classes:
+            self.classes.append(node.name)
+        # The Tcl commands creating, configuring and laying out the widget are collected into one script
+        options = dict(node.options)
+        if node.widget_name:
+            options['name'] = node.widget_name
+        self.emit('{} = create({}, {}{})'.format(var, node.name, parent, ', **{!r}'.format(options) if options else ''))
+        if node.widget_name:
+            self.emit('view.named_widgets[{!r}] = {}'.format(node.widget_name, var))
+
+        recorded = []
+        if node.commands or node.bindings:
+            self.emit('config = {}')
+            for key, name in node.commands:
+                self.emit('config[{!r}] = view.resolve_command({!r}, {})'.format(key, name, var))
+            change_method = ', widget_change_method={}.apply_change'.format(var) \
+                if hasattr(cls, 'apply_change') else ''
+            for key, binding_expr in node.bindings:
+                self.emit('config.update(view.bind({!r}, {!r}, {}{}))'.format(key, binding_expr, var, change_method))
+            recorded.append('{}.config(**config)'.format(var))
+        if node.layout != 'pack' or not issubclass(cls, tk.Menu):
+            if any(Binding.is_binding_expr(value) for value in node.layout_args.values()):
+                self.emit('layout_args = view.bind_layout({}, {!r}, {!r})'.format(
+                    var, node.layout, dict(node.layout_args)))
+                recorded.append('{}.{}(**layout_args)'.format(var, node.layout))
+            else:
+                recorded.append('{}.{}({})'.format(var, node.layout, ', '.join(
+                    '{}={!r}'.format(k, v) for k, v in node.layout_args.items())))
+        if recorded:
+            self.emit('with recording({}):'.format(var))
+            for line in recorded:
+                self.emit('    ' + line)
+
+        for child in node.children:
+            self.element(child, var)
+        if any(child.layout == 'grid' for child in node.children):
+            self.emit('Component.weight_grid_columns({})'.format(var))
+        return var
+
+
+def _source(node) -> str:
+    """ The source of a :class:`tkpf.parser.Element` that compiles to the same node as the given one.
+    Its text is kept apart from its attributes, since directives may interpret them differently. """
+    return 'parser.Element({!r}, {!r}, {!r}, [{}])'.format(
+        node.name, dict(node.attrib), node.text, ', '.join(_source(child) for child in node.children))
+
+
+def generate(path) -> str:
+    """ Return the source code of the Python module compiled from a template file """
+    if path.lower().endswith('.xml'):
+        tree = parser.wrap(Xml.parse(path))
+    else:
+        with open(path) as f:
+            tree = parser.wrap(template.load_yaml(f))
+    return _Generator(os.path.basename(path)).generate(template.compile_tree(tree))
+
+
+def output_path(path) -> str:
+    """ The path of the module generated from a template file, e.g. ``ExampleWindow_xml.py`` """
+    stem, ext = os.path.splitext(path)
+    return '{}_{}.py'.format(stem, ext[1:].lower())
+
+
+class TemplateFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    """ Imports a module named like ``ExampleWindow_xml`` by compiling ``ExampleWindow.xml`` from the same directory """
+
+    def find_spec(self, fullname, path, target=None):
+        package, _, name = fullname.rpartition('.')
+        for suffix, ext in _suffixes.items():
+            if name.endswith(suffix):
+                break
+        else:
+            return None
+        for directory in path or sys.path:
+            candidate = os.path.join(directory or '.', name[:-len(suffix)] + ext)
+            if os.path.isfile(candidate):
+                return importlib.util.spec_from_file_location(fullname, candidate, loader=self)
+        return None
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        code = compile(generate(module.__spec__.origin), module.__spec__.origin, 'exec')
+        exec(code, module.__dict__)
+
+
+def install_import_hook():
+    """ Make the templates on the import path importable as generated modules. Does nothing if already installed. """
+    if not any(isinstance(finder, TemplateFinder) for finder in sys.meta_path):
+        sys.meta_path.append(TemplateFinder())
+
+
+def main(argv=None):
+    argparser = argparse.ArgumentParser(prog='tkpf-codegen',
+                                        description='Compile tkpf templates to Python modules')
+    argparser.add_argument('templates', nargs='+', metavar='template', help='.xml or .yaml template file')
+    argparser.add_argument('-o', '--output', help='output file, only if there is a single template')
+    args = argparser.parse_args(argv)
+    if args.output and len(args.templates) > 1:
+        argparser.error('--output can only be used with a single template')
+    for path in args.templates:
+        output = args.output or output_path(path)
+        with open(output, 'w') as f:
+            f.write(generate(path))
+        print('{} -> {}'.format(path, output))
+
+
+if __name__ == '__main__':
+    main()
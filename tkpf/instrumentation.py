@@ -0,0 +1,289 @@
+"""
+Opt-in instrumentation of bindings and view construction, to find out which of them make a window slow::
+
+    from tkpf import instrumentation
+
+    instrumentation.enable(trace=True)
+    window = ExampleWindow(ExampleModel())
+    ...
+    print(instrumentation.report())
+    instrumentation.export_trace('trace.json')  # open it in chrome://tracing or ui.perfetto.dev
+
+Bindings are measured by the number of notifications they get, an estimate of the number of Tcl calls
+these result in, and the time spent updating the view. The writes of bound Tcl variables to the model are measured too.
+Construction time is summed per directive class, split into these phases:
+
+* ``parse``: parsing and compiling the template
+* ``inflate``: creating widgets and finding directive classes
+* ``bind``: creating bindings
+* ``layout``: applying configuration options and geometry management
+* ``script``: evaluating the Tcl scripts collected during construction, see :class:`TclBatch`
+* ``other``: the rest, such as the code of generated template modules
+
+Each phase is measured without the time spent constructing the directives nested in it.
+
+While disabled, nothing is instrumented at all: :func:`enable` swaps instrumented versions of the methods involved
+into their classes, and :func:`disable` puts the originals back.
+"""
+import json
+import os
+import threading
+import time
+import weakref
+
+from tkpf.Binding import Binding, SharedVariable
+from tkpf.Component import Component
+from tkpf.Directive import Structural
+from tkpf.TclBatch import TclBatch
+
+_clock = time.perf_counter
+_originals = {}  # (class, method name): original function
+_bindings = []  # BindingStats, in the order of the first notification of their bindings
+_binding_stats_index = weakref.WeakKeyDictionary()  # BindingStats by binding
+_construction = {}  # ConstructionStats by directive class name
+_directives = []  # The directives whose methods are running, innermost last
+_frames = []  # The time spent in the nested measured calls, per running measured call
+_events = []
+_max_events = 0
+_epoch = 0.0
+
+
+class BindingStats:
+    """ The counters and timings of one binding """
+    __slots__ = ('label', 'notifications', 'updates', 'tcl_calls', 'seconds', 'model_writes', 'model_seconds')
+
+    def __init__(self, label):
+        self.label = label
+        self.notifications = 0  # Changes of the source property
+        self.updates = 0  # Updates of the view, deferred ones are coalesced
+        self.tcl_calls = 0  # Estimated: one per update that sets a changed Tcl variable or configures the widget
+        self.seconds = 0.0  # Spent updating the view
+        self.model_writes = 0  # Writes of the Tcl variable of the binding to the model
+        self.model_seconds = 0.0
+
+    @property
+    def total_seconds(self):
+        return self.seconds + self.model_seconds
+
+
+class ConstructionStats:
+    """ The construction time of the instances of one directive class, split into phases """
+    __slots__ = ('name', 'count', 'total', 'parse', 'inflate', 'bind', 'layout', 'script', 'other')
+    phases = ('parse', 'inflate', 'bind', 'layout', 'script', 'other')
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.total = 0.0  # Including nested directives
+        for phase in self.phases:
+            setattr(self, phase, 0.0)
+
+
+def is_enabled() -> bool:
+    return bool(_originals)
+
+
+def enable(trace=False, max_events=1000000):
+    """
+    Start measuring bindings and construction. Statistics collected earlier are kept, see :func:`reset`.
+
+    :param trace: also record every measured call as an event for :func:`export_trace`
+    :param max_events: stop recording events after this many
+    """
+    global _max_events, _epoch
+    _max_events = max_events if trace else 0
+    if is_enabled():
+        return
+    _epoch = _clock()
+    _patch(Binding, 'notify_to_view', _notify_to_view)
+    _patch(Binding, 'update_view', _update_view)
+    _patch(SharedVariable, 'commit', _commit)
+    _patch(Structural, '__init__', _init)
+    _patch(Structural, 'construct', _construct)
+    Structural.batching_constructs.add(_construct)
+    _patch(Structural, 'inflate', _phase('inflate', Structural.inflate))
+    _patch(Structural, 'bind', _phase('bind', Structural.bind))
+    _patch(Structural, 'configure', staticmethod(_phase('layout', Structural.configure, static=True)))
+    _patch(Component, 'parsed_template', _phase('parse', Component.parsed_template))
+    _patch(Component, 'compiled_template', _phase('parse', Component.compiled_template))
+    _patch(TclBatch, 'flush', classmethod(_phase('script', TclBatch.flush.__func__, static=True)))
+
+
+def disable():
+    """ Stop measuring, and restore the uninstrumented methods """
+    for (cls, name), original in _originals.items():
+        setattr(cls, name, original)
+    _originals.clear()
+    Structural.batching_constructs.discard(_construct)
+
+
+def reset():
+    """ Forget the statistics and events collected so far """
+    _bindings.clear()
+    _construction.clear()
+    _events.clear()
+    _binding_stats_index.clear()
+
+
+def hottest_bindings(top=10) -> list:
+    """ The statistics of the bindings that took the most time, in descending order """
+    return sorted(_bindings, key=lambda stats: stats.total_seconds, reverse=True)[:top]
+
+
+def construction() -> list:
+    """ The construction statistics of the directive classes, the slowest first """
+    return sorted(_construction.values(), key=lambda stats: stats.total, reverse=True)
+
+
+def report(top=10) -> str:
+    """ A text table of the hottest bindings and the construction statistics """
+    lines = ['{:>8} {:>8} {:>8} {:>10} {:>8} {:>10}  {}'.format(
+        'notified', 'updates', '~Tcl', 'view ms', 'writes', 'model ms', 'binding')]
+    for stats in hottest_bindings(top):
+        lines.append('{:>8} {:>8} {:>8} {:>10.3f} {:>8} {:>10.3f}  {}'.format(
+            stats.notifications, stats.updates, stats.tcl_calls, stats.seconds * 1e3,
+            stats.model_writes, stats.model_seconds * 1e3, stats.label))
+    lines.append('')
+    lines.append('{:>8} {:>10} '.format('count', 'total ms') +
+                 ' '.join('{:>10}'.format(phase + ' ms') for phase in ConstructionStats.phases) + '  directive')
+    for stats in construction():
+        lines.append('{:>8} {:>10.3f} '.format(stats.count, stats.total * 1e3) +
+                     ' '.join('{:>10.3f}'.format(getattr(stats, phase) * 1e3) for phase in ConstructionStats.phases) +
+                     '  ' + stats.name)
+    return '\n'.join(lines)
+
+
+def export_trace(path):
+    """ Write the recorded events in the Trace Event Format of Chrome and Perfetto """
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': _events, 'displayTimeUnit': 'ms'}, f)
+
+
+def _patch(cls, name, replacement):
+    _originals[cls, name] = vars(cls)[name]
+    setattr(cls, name, replacement)
+
+
+def _original(cls, name):
+    return _originals[cls, name]
+
+
+def _record(name, category, start, elapsed):
+    if len(_events) < _max_events:
+        _events.append({'name': name, 'cat': category, 'ph': 'X', 'pid': os.getpid(),
+                        'tid': threading.get_ident(), 'ts': (start - _epoch) * 1e6, 'dur': elapsed * 1e6})
+
+
+def _binding_stats(binding) -> BindingStats:
+    try:
+        return _binding_stats_index[binding]
+    except KeyError:
+        stats = _binding_stats_index[binding] = BindingStats(_label(binding))
+        _bindings.append(stats)
+        return stats
+
+
+def _label(binding) -> str:
+    source = type(binding.source)
+    name = next((attr for klass in source.__mro__ for attr, member in vars(klass).items()
+                 if member is binding.source_property), '?')
+    arrow = {(True, False): '->', (False, True): '<-', (True, True): '<->'}.get(
+        (binding.to_view, binding.to_model), '--')
+    target = binding.target if binding.target is not None else '(menu entry)'
+    return '{}.{} {} {}.{}'.format(source.__name__, name, arrow, target, binding.target_property)
+
+
+def _notify_to_view(self, val, source):
+    _binding_stats(self).notifications += 1
+    _original(Binding, 'notify_to_view')(self, val, source)
+
+
+def _update_view(self, val):
+    stats = _binding_stats(self)
+    # Not counted exactly: a configuration or a change method may make any number of Tcl calls
+    changed = self.var is None or val != self.shared.value  # Unchanged Tcl variables are not set
+    start = _clock()
+    try:
+        _original(Binding, 'update_view')(self, val)
+    finally:
+        elapsed = _clock() - start
+        stats.updates += 1
+        stats.tcl_calls += changed
+        stats.seconds += elapsed
+        if _max_events:
+            _record(stats.label, 'binding', start, elapsed)
+
+
+def _commit(self):
+    start = _clock()
+    try:
+        _original(SharedVariable, 'commit')(self)
+    finally:
+        elapsed = _clock() - start
+        sharing = [binding for binding in self.subscriptions.bindings if getattr(binding, 'shared', None) is self]
+        for binding in sharing:
+            stats = _binding_stats(binding)
+            stats.model_writes += 1
+            stats.model_seconds += elapsed / len(sharing)
+        if _max_events and sharing:
+            _record(_binding_stats(sharing[0]).label, 'model', start, elapsed)
+
+
+def _construction_stats(directive) -> ConstructionStats:
+    name = type(directive).__name__
+    try:
+        return _construction[name]
+    except KeyError:
+        ret = _construction[name] = ConstructionStats(name)
+        return ret
+
+
+def _measure(directive, phase, fn, *args, **kwargs):
+    """ Call ``fn`` and add the time spent in it, except in nested measured calls, to a phase of the directive """
+    _frames.append(0.0)
+    start = _clock()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        elapsed = _clock() - start
+        nested = _frames.pop()
+        if _frames:
+            _frames[-1] += elapsed
+        if directive is not None:
+            stats = _construction_stats(directive)
+            setattr(stats, phase, getattr(stats, phase) + elapsed - nested)
+            if phase == 'other':
+                stats.count += 1
+                stats.total += elapsed
+            if _max_events:
+                _record('{}.{}'.format(stats.name, phase), 'construction', start, elapsed)
+
+
+def _phase(phase, method, static=False):
+    if static:
+        def instrumented(*args, **kwargs):
+            return _measure(_directives[-1] if _directives else None, phase, method, *args, **kwargs)
+    else:
+        def instrumented(self, *args, **kwargs):
+            _directives.append(self)
+            try:
+                return _measure(self, phase, method, self, *args, **kwargs)
+            finally:
+                _directives.pop()
+    return instrumented
+
+
+def _init(self, *args, **kwargs):
+    _directives.append(self)
+    try:
+        _measure(self, 'other', _original(Structural, '__init__'), self, *args, **kwargs)
+    finally:
+        _directives.pop()
+
+
+def _construct(self, elem, parent):
+    _directives.append(self)
+    try:
+        return _original(Structural, 'construct')(self, elem, parent)
+    finally:
+        _directives.pop()
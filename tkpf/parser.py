@@ -39,6 +39,15 @@ class DictWrapper:
         return {k: v for k, v in self.dic.items() if k != 'children'}
 
 
+class Element:
+    """ An element given by its parts, as built by the modules that :mod:`tkpf.codegen` generates """
+    def __init__(self, name, attrib, text=None, children=()):
+        self.name = name
+        self.attrib = attrib
+        self.text = text
+        self.children = children
+
+
 def wrap(obj):
     if isinstance(obj, Xml.ElementTree):
         obj = obj.getroot()
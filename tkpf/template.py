@@ -0,0 +1,107 @@
+import os
+import xml.etree.ElementTree as Xml
+from collections import namedtuple
+from types import MappingProxyType
+
+from tkpf import parser
+from tkpf.Binding import Binding
+
+_layout_managers = ('grid', 'place', 'pack')
+_cache = {}
+
+
+class Node(namedtuple('Node', ['name', 'text', 'attrib', 'children',
+                               'widget_name', 'viewmodel_expr',
+                               'options', 'layout', 'layout_args', 'extra',
+                               'commands', 'bindings'])):
+    """
+    One element of a compiled template. Every attribute is classified once, at compile time:
+
+    * ``options`` are the static configuration options
+    * ``layout`` is the name of the geometry manager and ``layout_args`` are its arguments
+    * ``extra`` holds the rest of the hyphenated attributes, grouped by prefix (e.g. ``tab-``)
+    * ``commands`` and ``bindings`` are tuples of (attribute, handler name or binding expression) pairs
+
+    ``attrib`` keeps the original attributes for directives that want to interpret them on their own.
+    """
+    __slots__ = ()
+
+
+def compile_tree(elem) -> Node:
+    """ Turn a parsed template (see :mod:`tkpf.parser`) into an immutable tree of :class:`Node` objects """
+    text = None
+    if elem.text and elem.text.strip():
+        text = elem.text.strip()
+
+    attrib = dict(elem.attrib)
+    widget_name = attrib.pop('name', None)
+    viewmodel_expr = attrib.pop('tkpf-model', None)
+    if text:
+        attrib['text'] = text
+
+    options, commands, bindings = {}, [], []
+    layout_args = {manager: {} for manager in _layout_managers}
+    extra = {}
+    for key, value in attrib.items():
+        if '-' in key:
+            prefix, name = key.split('-', 1)
+            if prefix in layout_args:
+                layout_args[prefix][name] = value
+            else:
+                extra.setdefault(prefix, {})[name] = value
+        elif 'command' in key:
+            commands.append((key, value))
+        elif Binding.is_binding_expr(value):
+            bindings.append((key, value))
+        else:
+            options[key] = value
+    layout = next(manager for manager in _layout_managers if layout_args[manager] or manager == 'pack')
+
+    return Node(name=elem.name, text=text,
+                attrib=MappingProxyType(dict(elem.attrib)),
+                children=tuple(compile_tree(child) for child in elem.children),
+                widget_name=widget_name, viewmodel_expr=viewmodel_expr,
+                options=MappingProxyType(options),
+                layout=layout, layout_args=MappingProxyType(layout_args[layout]),
+                extra=MappingProxyType({k: MappingProxyType(v) for k, v in extra.items()}),
+                commands=tuple(commands), bindings=tuple(bindings))
+
+
+def load_yaml(stream):
+    """ Parse a YAML template. PyYAML is only imported for the first one, since it takes long to import. """
+    import yaml
+    return yaml.safe_load(stream)
+
+
+def parse(cls):
+    """ Parse the template of a component class """
+    if cls.template:
+        return parser.wrap(Xml.fromstring(cls.template))
+    elif cls.template_yaml:
+        return parser.wrap(load_yaml(cls.template_yaml))
+    elif cls.template_path:
+        if cls.template_path.lower().endswith('.xml'):
+            return parser.wrap(Xml.parse(cls.template_path))
+        elif cls.template_path.lower().endswith('.yaml'):
+            with open(cls.template_path) as bf:
+                return parser.wrap(load_yaml(bf))
+    raise Exception('Component template not specified')
+
+
+def load(cls) -> Node:
+    """
+    Return the compiled template of a component class.
+    It is parsed and compiled only once per class and template source,
+    or again when the modification time of the template file changes.
+    """
+    source = cls.template or cls.template_yaml or cls.template_path
+    mtime = None
+    if not (cls.template or cls.template_yaml) and cls.template_path:
+        mtime = os.path.getmtime(cls.template_path)
+
+    cached = _cache.get((cls, source))
+    if cached and cached[0] == mtime:
+        return cached[1]
+    ret = compile_tree(parse(cls))
+    _cache[cls, source] = mtime, ret
+    return ret